@@ -20,7 +20,8 @@ dbUrl: str = (
 config.set_main_option("sqlalchemy.url", dbUrl)
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# In-process callers (eduschedule.adapters.sql.migrations) keep their own logging setup.
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -77,6 +78,16 @@ def run_migrations_online() -> None:
     """
     importModels()
 
+    # Reuse the caller's connection when migrating in-process
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(
+            connection=connection, target_metadata=target_metadata, render_as_batch=True
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
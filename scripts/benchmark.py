@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""Benchmarks for the scheduler, repositories and CLI import.
+
+Every case runs against deterministic synthetic data (see ``makeEmployees``)
+and writes JSON that can be diffed across commits:
+
+    python scripts/benchmark.py --out bench.json
+    python scripts/benchmark.py --only scheduler --compare bench.json
+
+``--compare`` exits non-zero when a case got slower than ``--threshold``
+times its baseline median.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from eduschedule.domain.employee import Employee
+from eduschedule.domain.schedule import Schedule
+from eduschedule.domain.unavailability import Unavailability
+from eduschedule.domain.scheduler import generate_schedule
+
+ROOT = Path(__file__).resolve().parents[1]
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+WEEK = timedelta(weeks=1)
+
+# name -> (group, function returning a list of {"name", "params", "seconds"} results)
+CASES: dict[str, tuple[str, Callable[[argparse.Namespace], list[dict]]]] = {}
+
+def case(name: str, group: str):
+    def register(fn):
+        CASES[name] = (group, fn)
+        return fn
+    return register
+
+
+def makeEmployees(n: int, weeks: int, *, unavailabilityDensity: float = 0.1, scheduleLoad: float = 0.1, seed: int = 0) -> list[Employee]:
+    """``n`` employees over ``weeks`` weeks from ``EPOCH``, identical for the same arguments.
+
+    ``unavailabilityDensity`` and ``scheduleLoad`` are the approximate share of each
+    employee's horizon covered by unavailabilities and by existing schedules.
+    """
+    rng = random.Random(seed)
+    hours = weeks * 7 * 24
+    emps = []
+    for empId in range(1, n + 1):
+        emps.append(Employee(
+            id=empId,
+            name=f"Employee {empId}",
+            email=f"bench{empId}@example.com",
+            role=f"role{empId % 5}",
+            maxHours=rng.randint(10, 40) * weeks,
+            unavailabilities=[
+                Unavailability(id=None, employeeId=empId, startUTC=s, endUTC=e)
+                for s, e in _blocks(rng, hours, unavailabilityDensity)
+            ],
+            schedules=[
+                Schedule(id=None, employeeId=empId, startUTC=s, endUTC=e)
+                for s, e in _blocks(rng, hours, scheduleLoad)
+            ],
+        ))
+    return emps
+
+def _blocks(rng: random.Random, hours: int, density: float) -> list[tuple[datetime, datetime]]:
+    # Non-overlapping 1-4 hour blocks covering roughly ``density`` of the horizon
+    blocks = []
+    cursor = 0
+    while density > 0:
+        length = rng.randint(1, 4)
+        cursor += int(rng.expovariate(density / length)) + 1
+        if cursor + length > hours:
+            break
+        blocks.append((EPOCH + timedelta(hours=cursor), EPOCH + timedelta(hours=cursor + length)))
+        cursor += length
+    return blocks
+
+
+def timed(fn: Callable[[], object], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+def result(name: str, params: dict, seconds: list[float]) -> dict:
+    return {
+        "name": name,
+        "params": params,
+        "seconds": seconds,
+        "min": min(seconds),
+        "median": statistics.median(seconds),
+    }
+
+
+@case("generate_schedule", "scheduler")
+def benchGenerateSchedule(args) -> list[dict]:
+    out = []
+    for n, weeks in ((50, 1), (200, 4), (1000, 4)):
+        emps = makeEmployees(n, weeks, unavailabilityDensity=args.density, scheduleLoad=args.load, seed=args.seed)
+        for mode in ("slots", "runs"):
+            params = {"employees": n, "weeks": weeks, "mode": mode}
+            out.append(result(
+                f"generate_schedule[{n}x{weeks}w,{mode}]",
+                params,
+                timed(lambda: generate_schedule(EPOCH, EPOCH + weeks * WEEK, emps, mode=mode), args.repeat),
+            ))
+    return out
+
+
+def _tempDatabase(tmp: Path, name: str) -> str:
+    from eduschedule.adapters.sql.base import Base
+    import eduschedule.adapters.sql.models.employee, eduschedule.adapters.sql.models.schedule, eduschedule.adapters.sql.models.unavailability  # noqa: F401
+    url = f"sqlite:///{tmp / name}"
+    eng = create_engine(url, future=True)
+    Base.metadata.create_all(eng)
+    eng.dispose()
+    return url
+
+def _seedDatabase(url: str, emps: list[Employee]) -> None:
+    from eduschedule.adapters.sql.models.schedule import Schedule as ormSchedule
+    from eduschedule.adapters.sql.models.unavailability import Unavailability as ormUnavailability
+    from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+    eng = create_engine(url, future=True)
+    with sessionmaker(eng, future=True)() as s:
+        EmployeeRepo(s).bulkCreate({"name": e.name, "email": e.email, "roleName": e.role, "maxHours": e.maxHours} for e in emps)
+        unvs = [{"employee_id": u.employeeId, "start_utc": u.startUTC, "end_utc": u.endUTC} for e in emps for u in e.unavailabilities]
+        schs = [{"employee_id": x.employeeId, "start_utc": x.startUTC, "end_utc": x.endUTC} for e in emps for x in e.schedules]
+        if unvs:
+            s.execute(insert(ormUnavailability), unvs)
+        if schs:
+            s.execute(insert(ormSchedule), schs)
+        s.commit()
+    eng.dispose()
+
+@case("repositories", "repo")
+def benchRepositories(args) -> list[dict]:
+    from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+    from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+    from eduschedule.domain.problem import SchedulingProblem
+    out = []
+    n, weeks = args.employees, args.weeks
+    emps = makeEmployees(n, weeks, unavailabilityDensity=args.density, scheduleLoad=args.load, seed=args.seed)
+    params = {"employees": n, "weeks": weeks}
+    with tempfile.TemporaryDirectory() as tmp:
+        url = _tempDatabase(Path(tmp), "repo.db")
+        _seedDatabase(url, emps)
+        eng = create_engine(url, future=True)
+        Session = sessionmaker(eng, future=True)
+
+        def listWithDetails(compact: bool):
+            with Session() as s:
+                EmployeeRepo(s).listWithDetails(compact=compact)
+        out.append(result("EmployeeRepo.listWithDetails", params, timed(lambda: listWithDetails(False), args.repeat)))
+        out.append(result("EmployeeRepo.listWithDetails[compact]", params, timed(lambda: listWithDetails(True), args.repeat)))
+
+        # "Who is free?" in SQL versus loading everyone and asking the compiled problem
+        freeStart = EPOCH + timedelta(days=3, hours=10)
+        freeEnd = freeStart + timedelta(hours=2)
+
+        def freeBetween():
+            with Session() as s:
+                EmployeeRepo(s).freeBetween(freeStart, freeEnd)
+
+        def freeInPython():
+            with Session() as s:
+                SchedulingProblem(EmployeeRepo(s).listWithDetails(compact=True)).free_employees(freeStart, freeEnd)
+        out.append(result("EmployeeRepo.freeBetween", params, timed(freeBetween, args.repeat)))
+        out.append(result("EmployeeRepo.freeBetween[python]", params, timed(freeInPython, args.repeat)))
+
+        def coverageGaps(byRole: bool):
+            with Session() as s:
+                repo = ScheduleRepo(s)
+                repo.coverageGapsByRole(EPOCH, EPOCH + weeks * WEEK) if byRole else repo.coverageGaps(EPOCH, EPOCH + weeks * WEEK)
+        out.append(result("ScheduleRepo.coverageGaps", params, timed(lambda: coverageGaps(False), args.repeat)))
+        out.append(result("ScheduleRepo.coverageGaps[byRole]", params, timed(lambda: coverageGaps(True), args.repeat)))
+
+        # Probe windows after the seeded horizon so creates never hit an existing conflict
+        probes = [(e.id, EPOCH + weeks * WEEK + timedelta(hours=i)) for i, e in enumerate(emps[:200])]
+
+        def conflicts():
+            with Session() as s:
+                repo = ScheduleRepo(s)
+                for empId, start in probes:
+                    repo.conflicts(empId, start, start + timedelta(hours=1))
+        out.append(result("ScheduleRepo.conflicts", {**params, "calls": len(probes)}, timed(conflicts, args.repeat)))
+
+        def create():
+            with Session() as s:
+                repo = ScheduleRepo(s)
+                for empId, start in probes:
+                    repo.create(employeeId=empId, startTime=start, endTime=start + timedelta(hours=1))
+                s.rollback()
+        out.append(result("ScheduleRepo.create", {**params, "calls": len(probes)}, timed(create, args.repeat)))
+        eng.dispose()
+    return out
+
+@case("import-employees", "cli")
+def benchImportEmployees(args) -> list[dict]:
+    from typer.testing import CliRunner
+    from eduschedule.adapters.sql.engine import dispose_engines
+    from eduschedule.cli.main import app
+    n = args.employees * 10
+    seconds = []
+    with tempfile.TemporaryDirectory() as tmp:
+        csvFile = Path(tmp) / "employees.csv"
+        with csvFile.open("w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["name", "email", "role", "max_hours"])
+            for e in makeEmployees(n, 1, unavailabilityDensity=0, scheduleLoad=0, seed=args.seed):
+                writer.writerow([e.name, e.email, e.role, e.maxHours])
+        runner = CliRunner()
+        for i in range(args.repeat):
+            env = {"DATABASE_URL": _tempDatabase(Path(tmp), f"import{i}.db")}
+            t0 = time.perf_counter()
+            res = runner.invoke(app, ["import-employees", str(csvFile)], env=env)
+            seconds.append(time.perf_counter() - t0)
+            if res.exit_code != 0:
+                raise RuntimeError(res.output)
+        dispose_engines()
+    return [result("cli.import-employees", {"rows": n}, seconds)]
+
+@case("sqlite-profiles", "sqlite")
+def benchSqliteProfiles(args) -> list[dict]:
+    """Import (one commit per batch) and one-commit-per-row schedule writes under each SQLite profile."""
+    from typer.testing import CliRunner
+    from eduschedule import config
+    from eduschedule.adapters.sql.engine import SQLITE_PROFILES, dispose_engines, session_scope
+    from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+    from eduschedule.cli.main import app
+    n = args.employees * 10
+    writes = 200
+    out = []
+    saved = (os.environ.get("DATABASE_URL"), config.SQLITE_PROFILE)
+    with tempfile.TemporaryDirectory() as tmp:
+        csvFile = Path(tmp) / "employees.csv"
+        with csvFile.open("w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["name", "email", "role", "max_hours"])
+            for e in makeEmployees(n, 1, unavailabilityDensity=0, scheduleLoad=0, seed=args.seed):
+                writer.writerow([e.name, e.email, e.role, e.maxHours])
+        runner = CliRunner()
+        try:
+            for profile in SQLITE_PROFILES:
+                config.SQLITE_PROFILE = profile
+                importSeconds, writeSeconds = [], []
+                for i in range(args.repeat):
+                    url = _tempDatabase(Path(tmp), f"{profile}{i}.db")
+                    os.environ["DATABASE_URL"] = url
+                    t0 = time.perf_counter()
+                    res = runner.invoke(app, ["import-employees", str(csvFile), "--batch-size", "100", "--commit-batches"], env={"DATABASE_URL": url})
+                    importSeconds.append(time.perf_counter() - t0)
+                    if res.exit_code != 0:
+                        raise RuntimeError(res.output)
+                    t0 = time.perf_counter()
+                    for k in range(writes):
+                        with session_scope() as s:
+                            start = EPOCH + timedelta(hours=k)
+                            ScheduleRepo(s).create(employeeId=k % n + 1, startTime=start, endTime=start + timedelta(hours=1))
+                    writeSeconds.append(time.perf_counter() - t0)
+                    dispose_engines()
+                out.append(result(f"sqlite[{profile}].import-employees", {"rows": n, "batchSize": 100}, importSeconds))
+                out.append(result(f"sqlite[{profile}].schedule-writes", {"commits": writes}, writeSeconds))
+        finally:
+            url, config.SQLITE_PROFILE = saved
+            if url is None:
+                os.environ.pop("DATABASE_URL", None)
+            else:
+                os.environ["DATABASE_URL"] = url
+            dispose_engines()
+    return out
+
+@case("async-reads", "async")
+def benchAsyncReads(args) -> list[dict]:
+    """Per-employee dashboard reads: one sync session after another vs. concurrent async sessions."""
+    import asyncio
+    from eduschedule.adapters.sql.async_engine import async_session_scope, dispose_async_engines
+    from eduschedule.adapters.sql.engine import dispose_engines, session_scope
+    from eduschedule.adapters.sql.repositories.aio import AsyncEmployeeRepo, AsyncUnavailabilityRepo
+    from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+    from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
+    n, weeks = args.employees, args.weeks
+    emps = makeEmployees(n, weeks, unavailabilityDensity=args.density, scheduleLoad=args.load, seed=args.seed)
+    window = (EPOCH, EPOCH + weeks * WEEK)
+    params = {"employees": n, "weeks": weeks, "requests": n}
+    out = []
+    saved = os.environ.get("DATABASE_URL")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = _tempDatabase(Path(tmp), "async.db")
+        _seedDatabase(url, emps)
+        os.environ["DATABASE_URL"] = url
+        try:
+            def syncReads():
+                for e in emps:
+                    with session_scope() as s:
+                        EmployeeRepo(s).getById(e.id)
+                        UnavailabilityRepo(s).listUnavailabilitiesBetween(e.id, *window)
+            out.append(result("reads.sync", params, timed(syncReads, args.repeat)))
+
+            async def read(empId: int):
+                async with async_session_scope() as s:
+                    await AsyncEmployeeRepo(s).getById(empId)
+                    await AsyncUnavailabilityRepo(s).listUnavailabilitiesBetween(empId, *window)
+
+            async def asyncReads():
+                seconds = []
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    await asyncio.gather(*(read(e.id) for e in emps))
+                    seconds.append(time.perf_counter() - t0)
+                await dispose_async_engines()
+                return seconds
+            out.append(result("reads.async", params, asyncio.run(asyncReads())))
+        finally:
+            dispose_engines()
+            if saved is None:
+                os.environ.pop("DATABASE_URL", None)
+            else:
+                os.environ["DATABASE_URL"] = saved
+    return out
+
+
+def _gitCommit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current: list[dict], baselinePath: Path, threshold: float) -> list[str]:
+    baseline = {r["name"]: r for r in json.loads(baselinePath.read_text())["results"]}
+    regressions = []
+    for r in current:
+        old = baseline.get(r["name"])
+        if old is None:
+            continue
+        ratio = r["median"] / old["median"] if old["median"] else float("inf")
+        print(f'{r["name"]:<45} {old["median"]:.4f}s -> {r["median"]:.4f}s  x{ratio:.2f}')
+        if ratio > threshold:
+            regressions.append(r["name"])
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", help="Run only this case or group (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--employees", type=int, default=500, help="Employees for the repository and import cases")
+    parser.add_argument("--weeks", type=int, default=4, help="Horizon for the repository cases")
+    parser.add_argument("--density", type=float, default=0.1, help="Share of the horizon covered by unavailabilities")
+    parser.add_argument("--load", type=float, default=0.1, help="Share of the horizon covered by existing schedules")
+    parser.add_argument("--out", type=Path, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    results = []
+    for name, (group, fn) in CASES.items():
+        if args.only and name not in args.only and group not in args.only:
+            continue
+        print(f"running {name}...", file=sys.stderr)
+        results.extend(fn(args))
+
+    report = {
+        "commit": _gitCommit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {k: v for k, v in vars(args).items() if k not in ("out", "compare", "only")},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text)
+    elif not args.compare:
+        print(text)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import threading
+from contextlib import asynccontextmanager
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from eduschedule.adapters.sql.engine import _addListeners, _dbUrl, _poolOptions, sqlite_pragmas
+
+# Async drivers used for DATABASE_URLs that name a sync driver (or none)
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+# Async engines are cached like the sync ones; dispose them with ``await dispose_async_engines()``
+# before the event loop that used them closes
+_engines: dict[tuple, tuple[AsyncEngine, async_sessionmaker]] = {}
+_enginesLock = threading.Lock()
+
+def _asyncUrl(url: str) -> str:
+    u = make_url(url)
+    backend = u.get_backend_name()
+    if u.get_driver_name() in _ASYNC_DRIVERS.values():
+        return url
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return u.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+def _makeAsyncEngine(url: str, pragmas: dict) -> AsyncEngine:
+    asyncUrl = _asyncUrl(url)
+    try:
+        eng = create_async_engine(asyncUrl, **_poolOptions(url))
+    except ImportError as exc:
+        raise ImportError("The async repositories require an async driver (pip install 'eduschedule[async]')") from exc
+    _addListeners(eng.sync_engine, url, pragmas)
+    return eng
+
+def _cached(url: str) -> tuple[AsyncEngine, async_sessionmaker]:
+    pragmas = sqlite_pragmas()
+    key = (url, tuple(sorted(pragmas.items())))
+    entry = _engines.get(key)
+    if entry is None:
+        with _enginesLock:
+            entry = _engines.get(key)
+            if entry is None:
+                eng = _makeAsyncEngine(url, pragmas)
+                entry = (eng, async_sessionmaker(bind=eng, autoflush=False, expire_on_commit=False))
+                _engines[key] = entry
+    return entry
+
+def get_async_engine() -> AsyncEngine:
+    """Return the pooled async engine for the current DATABASE_URL, creating it on first use."""
+    return _cached(_dbUrl())[0]
+
+async def dispose_async_engines() -> None:
+    """Close every pooled async connection and forget the cached engines."""
+    with _enginesLock:
+        entries = list(_engines.values())
+        _engines.clear()
+    for eng, _ in entries:
+        await eng.dispose()
+
+@asynccontextmanager
+async def async_session_scope():
+    """Async counterpart of ``session_scope``: commit on success, roll back on error.
+
+    A session must not be shared between concurrently running tasks; open one scope per task
+    to fan reads out over the pool.
+    """
+    _, Session = _cached(_dbUrl())
+    s = Session()
+    try:
+        yield s
+        await s.commit()
+    except Exception:
+        await s.rollback()
+        raise
+    finally:
+        await s.close()
@@ -0,0 +1,140 @@
+"""In-process read-through cache for employee and role lookups.
+
+Each cached value is stored with the write versions of the tables it was read
+from.  Every session that writes a table (ORM flushes as well as Core
+``insert``/``update``/``delete`` statements) bumps that table's version when it
+writes and again when its transaction ends, so stale entries simply stop
+matching; nothing has to be found and evicted.  Writes made by other processes
+are only noticed when the TTL (``EDUSCHEDULE_CACHE_TTL``) runs out.
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+from eduschedule import config, profiling
+
+# Write version per table name. Reads are cached together with the versions of the tables they
+# depend on, so bumping a version invalidates every dependent entry without scanning the cache.
+_versions: dict[str, int] = {}
+_versionsLock = threading.Lock()
+
+def version(table: str) -> int:
+    return _versions.get(table, 0)
+
+def bump(tables: Iterable[str]) -> None:
+    with _versionsLock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+class VersionedCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds or when a table they read changes."""
+
+    def __init__(self, name: str, *, maxsize: int | None = None, ttl: float | None = None):
+        self.name = name
+        self.maxsize = config.CACHE_SIZE if maxsize is None else maxsize
+        self.ttl = config.CACHE_TTL if ttl is None else ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, float, tuple[int, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def getOrLoad(self, key: Hashable, tables: tuple[str, ...], load: Callable[[], Any], *, session: Session | None = None) -> Any:
+        """Return the cached value for ``key`` or ``load()`` it, tagged with the current ``tables`` versions.
+
+        ``None`` results are not cached, so a row created by another process is found at once.  When
+        ``session`` (the one ``load`` reads through) has uncommitted writes to any of ``tables``, the
+        cache is bypassed: what it reads must not be served to other sessions.
+        """
+        if not self.enabled or _hasWritten(session, tables):
+            return load()
+        versions = tuple(version(t) for t in tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now and entry[2] == versions:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value = load()
+        # Loading may autoflush pending changes, which only then mark the session as a writer
+        if value is None or _hasWritten(session, tables):
+            return value
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl, versions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+_caches: dict[str, VersionedCache] = {}
+
+def cache(name: str) -> VersionedCache:
+    """The process-wide cache called ``name``."""
+    entry = _caches.get(name)
+    if entry is None:
+        entry = _caches.setdefault(name, VersionedCache(name))
+    return entry
+
+def stats() -> dict[str, dict]:
+    return {name: c.stats() for name, c in sorted(_caches.items())}
+
+def clearAll() -> None:
+    for c in _caches.values():
+        c.clear()
+
+def keyFor(session: Session, *parts: Hashable) -> tuple:
+    # Entries are per database: the same id means different rows in different files
+    return (str(session.get_bind().url), *parts)
+
+# Tables written in a session are bumped immediately (so that session's own reads miss) and again
+# when its transaction ends, so a value another session cached in between cannot outlive the commit
+# or rollback.
+def _touch(session: Session, tables: Iterable[str]) -> None:
+    tables = set(tables)
+    if tables:
+        session.info.setdefault("cacheTables", set()).update(tables)
+        bump(tables)
+
+def _hasWritten(session: Session | None, tables: Iterable[str]) -> bool:
+    written = session.info.get("cacheTables") if session is not None else None
+    return bool(written) and not written.isdisjoint(tables)
+
+@event.listens_for(Session, "do_orm_execute")
+def _onExecute(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None:
+            _touch(state.session, [table.name])
+
+@event.listens_for(Session, "after_flush")
+def _onFlush(session: Session, _ctx) -> None:
+    # A parent is "dirty" when only a relationship collection changed; that writes no row of its own
+    dirty = (obj for obj in session.dirty if session.is_modified(obj, include_collections=False))
+    _touch(session, (obj.__table__.name for obj in (*session.new, *dirty, *session.deleted) if hasattr(obj, "__table__")))
+
+@event.listens_for(Session, "after_transaction_end")
+def _onTransactionEnd(session: Session, transaction) -> None:
+    # Commit, rollback and close all end the outermost transaction; savepoints are not final
+    if transaction.parent is not None:
+        return
+    tables = session.info.pop("cacheTables", None)
+    if tables:
+        bump(tables)
+
+profiling.register_stats("cache", stats)
@@ -1,34 +1,134 @@
 from __future__ import annotations
 import os
+import re
+import threading
+import time
 from contextlib import contextmanager
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
+from eduschedule import config, profiling
+
+# SQLite pragma presets, selected with config.SQLITE_PROFILE. WAL lets readers run alongside a writer;
+# synchronous=NORMAL in WAL mode skips the fsync on every commit (a power loss can drop the last
+# commits but never corrupts the file), FULL keeps one per commit.
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    "default": {},
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+_PRAGMA_VALUE = re.compile(r"-?[A-Za-z0-9_]+")
+
+# One engine (and its connection pool) per DATABASE_URL and SQLite profile for the whole process
+_engines: dict[tuple, tuple[Engine, sessionmaker]] = {}
+_enginesLock = threading.Lock()
 
 def _dbUrl() -> str:
     return os.getenv("DATABASE_URL", "sqlite:///./eduschedule.db")
 
-def _makeEngine():
-    eng = create_engine(_dbUrl(), future=True)
+def _poolOptions(url: str) -> dict:
+    u = make_url(url)
+    if u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single connection per thread; there is no pool to size
+        return {}
+    return {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+    }
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    """The pragmas for ``config.SQLITE_PROFILE`` with the ``config.SQLITE_PRAGMAS`` overrides applied."""
+    try:
+        pragmas = dict(SQLITE_PROFILES[config.SQLITE_PROFILE])
+    except KeyError:
+        raise ValueError(f"Unknown SQLite profile {config.SQLITE_PROFILE!r}; choose one of {', '.join(SQLITE_PROFILES)}") from None
+    pragmas.update(config.SQLITE_PRAGMAS)
+    for name, value in pragmas.items():
+        if not _PRAGMA_VALUE.fullmatch(str(value)):
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+    return pragmas
+
+def _makeEngine(url: str | None = None, pragmas: dict | None = None):
+    url = url or _dbUrl()
+    eng = create_engine(url, future=True, **_poolOptions(url))
+    _addListeners(eng, url, pragmas if pragmas is not None else sqlite_pragmas())
+    return eng
+
+def _addListeners(eng: Engine, url: str, tuning: dict) -> None:
+    # Shared by the sync engines here and the async engines in async_engine.py (via .sync_engine)
+    isSqlite = make_url(url).get_backend_name() == "sqlite"
     @event.listens_for(eng, "connect")
     def foreignKeyOn(dbapiConn, _):
+        cursor = dbapiConn.cursor()
         try:
-            dbapiConn.execute("PRAGMA foreign_keys=ON")
-            dbapiConn.execute("PRAGMA read_uncommitted = true")
-        except Exception:
-            pass
-    return eng
+            try:
+                cursor.execute("PRAGMA foreign_keys=ON")
+                cursor.execute("PRAGMA read_uncommitted = true")
+            except Exception:
+                pass
+            if isSqlite:
+                for name, value in tuning.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    @event.listens_for(eng, "before_cursor_execute")
+    def statementStart(conn, cursor, statement, parameters, context, executemany):
+        if profiling.enabled():
+            conn.info.setdefault("profileStart", []).append(time.perf_counter())
+    @event.listens_for(eng, "after_cursor_execute")
+    def statementEnd(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("profileStart")
+        if starts:
+            start = starts.pop()
+            profiling.record_statement(statement, start, time.perf_counter() - start)
+
+def _cached(url: str) -> tuple[Engine, sessionmaker]:
+    pragmas = sqlite_pragmas()
+    key = (url, tuple(sorted(pragmas.items())))
+    entry = _engines.get(key)
+    if entry is None:
+        with _enginesLock:
+            entry = _engines.get(key)
+            if entry is None:
+                eng = _makeEngine(url, pragmas)
+                entry = (eng, sessionmaker(bind=eng, autoflush=False, autocommit=False, future=True))
+                _engines[key] = entry
+    return entry
+
+def get_engine() -> Engine:
+    """Return the pooled engine for the current DATABASE_URL, creating it on first use."""
+    return _cached(_dbUrl())[0]
+
+def dispose_engines() -> None:
+    """Close every pooled connection and forget the cached engines (shutdown, tests)."""
+    with _enginesLock:
+        entries = list(_engines.values())
+        _engines.clear()
+    for eng, _ in entries:
+        eng.dispose()
 
 @contextmanager
 def session_scope():
-    eng = _makeEngine()
-    Session = sessionmaker(bind=eng, autoflush=False, autocommit=False, future=True)
+    _, Session = _cached(_dbUrl())
     s = Session()
     try:
         yield s
-        s.commit()
+        with profiling.phase("session.commit"):
+            s.commit()
     except Exception:
         s.rollback()
         raise
     finally:
         s.close()
-        eng.dispose()
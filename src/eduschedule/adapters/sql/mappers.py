@@ -3,16 +3,25 @@ from eduschedule.adapters.sql.models.employee import Employee as ormEmployee, Ro
 from eduschedule.domain.unavailability import Unavailability as domainUnavailability
 from eduschedule.adapters.sql.models.unavailability import Unavailability as ormUnavailability
 from eduschedule.domain.schedule import Schedule as domainSchedule
+from eduschedule.domain.intervals import IntervalArray
 from eduschedule.adapters.sql.models.schedule import Schedule as ormSchedule
+from eduschedule.adapters.sql.cache import cache, keyFor
 from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
-def toDomainEmployee(o: ormEmployee, *, withUnavailability: bool=False, withSchedules: bool=False) -> domainEmployee:
+def toDomainEmployee(o: ormEmployee, *, withUnavailability: bool=False, withSchedules: bool=False, bookedSeconds: float | None=None) -> domainEmployee:
     unvs = [toDomainUnavailability(i) for i in o.unavailabilities] if withUnavailability else []
     schs = [toDomainSchedule(i) for i in o.schedules] if withSchedules else []
     role = o.role.name if o.role else None
-    return domainEmployee(id=o.id, name=o.name, email=o.email, role=role, maxHours=o.max_hours, active=o.active, unavailabilities=unvs, schedules=schs)
+    return domainEmployee(id=o.id, name=o.name, email=o.email, role=role, maxHours=o.max_hours, active=o.active, unavailabilities=unvs, schedules=schs, bookedSeconds=bookedSeconds)
+
+def toDomainEmployeeRow(row) -> domainEmployee:
+    """Build an employee from an ``(id, name, email, role name, max_hours, active)`` column row."""
+    empId, name, email, role, maxHours, active = row
+    return domainEmployee(id=empId, name=name, email=email, role=role, maxHours=maxHours, active=active)
 
 def toDomainUnavailability(o: ormUnavailability) -> domainUnavailability:
     start = o.start_utc
@@ -38,17 +47,40 @@ def toDomainSchedule(o: ormSchedule) -> domainSchedule:
         end = end.replace(tzinfo=timezone.utc)
     return domainSchedule(id=o.id, employeeId=o.employee_id, startUTC=start, endUTC=end)
 
+def toIntervalArrays(rows, kind: type[domainSchedule] | type[domainUnavailability]) -> dict[int, IntervalArray]:
+    """Group ``(id, employee_id, start epoch, end epoch[, note])`` rows into one compact array per employee."""
+    arrays: dict[int, IntervalArray] = {}
+    for row in rows:
+        arr = arrays.get(row[1])
+        if arr is None:
+            arr = arrays[row[1]] = IntervalArray(kind)
+        arr.append_epoch(*row)
+    return arrays
+
 def updateRole(session, roleName: str | None) -> roleObject | None:
     if roleName is None or not roleName.strip():
         return None
     roleName = roleName.strip()
-    role = session.scalar(select(roleObject).where(roleObject.name == roleName))
+    roleId = cache("roles").getOrLoad(
+        keyFor(session, roleName), ("roles",), lambda: session.scalar(select(roleObject.id).where(roleObject.name == roleName)),
+        session=session,
+    )
+    role = _attachRole(session, roleId, roleName) if roleId is not None else None
     if not role:
         role = roleObject(name=roleName)
         session.add(role)
         session.flush()
     return role
 
+def _attachRole(session, roleId: int, roleName: str) -> roleObject:
+    # A cached id becomes a persistent instance without a SELECT (or reuses the one already in the session)
+    role = session.identity_map.get(identity_key(roleObject, roleId))
+    if role is None:
+        role = roleObject(id=roleId, name=roleName)
+        make_transient_to_detached(role)
+        role = session.merge(role, load=False)
+    return role
+
 def localToUTC(localTime: datetime, timeZone: str) -> datetime:
     tz = ZoneInfo(timeZone)
     if localTime.tzinfo is None:
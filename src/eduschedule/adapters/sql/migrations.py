@@ -0,0 +1,70 @@
+from __future__ import annotations
+import threading
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Engine
+from eduschedule.adapters.sql.engine import get_engine
+
+class SchemaNotCurrentError(RuntimeError):
+    """Raised when the database is not migrated to the latest Alembic revision."""
+
+# Engine URLs already verified to be at head, so repeated checks cost nothing
+_verified: set[str] = set()
+_verifiedLock = threading.Lock()
+_head: str | None = None
+
+def _alembicIni() -> Path:
+    # src/eduschedule/adapters/sql/migrations.py -> repository root; fall back to the working directory
+    for root in (Path(__file__).resolve().parents[4], Path.cwd()):
+        ini = root / "alembic.ini"
+        if ini.is_file():
+            return ini
+    raise FileNotFoundError("alembic.ini not found next to the package or in the working directory")
+
+def _config(engine: Engine) -> Config:
+    cfg = Config(str(_alembicIni()))
+    cfg.set_main_option("sqlalchemy.url", engine.url.render_as_string(hide_password=False).replace("%", "%%"))
+    cfg.attributes["configure_logger"] = False
+    return cfg
+
+def head_revision() -> str | None:
+    """The newest revision in the migration scripts (read once per process)."""
+    global _head
+    if _head is None:
+        _head = ScriptDirectory.from_config(Config(str(_alembicIni()))).get_current_head()
+    return _head
+
+def current_revision(engine: Engine | None = None) -> str | None:
+    """The revision recorded in the database's ``alembic_version`` table, if any."""
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+def upgrade(revision: str = "head", *, engine: Engine | None = None) -> None:
+    """Run ``alembic upgrade`` in this process on ``engine`` (the pooled engine by default)."""
+    engine = engine or get_engine()
+    cfg = _config(engine)
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, revision)
+    with _verifiedLock:
+        _verified.discard(str(engine.url))
+
+def ensure_schema_current(engine: Engine | None = None) -> None:
+    """Raise :class:`SchemaNotCurrentError` unless the database is at the script head.
+
+    The comparison is one ``alembic_version`` read; once it passes, later calls for the same
+    database return immediately.
+    """
+    engine = engine or get_engine()
+    key = str(engine.url)
+    if key in _verified:
+        return
+    current, head = current_revision(engine), head_revision()
+    if current != head:
+        raise SchemaNotCurrentError(f"Database schema is at {current or 'no revision'}, expected {head}; run 'eduschedule db-init'")
+    with _verifiedLock:
+        _verified.add(key)
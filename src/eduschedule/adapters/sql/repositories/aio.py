@@ -0,0 +1,90 @@
+"""Async repositories for ``AsyncSession`` (see ``async_session_scope``).
+
+Each method runs the matching synchronous repository method through
+``AsyncSession.run_sync``, so queries, mappers and the returned domain objects
+are exactly those of the sync layer while all I/O goes through the async
+driver.  Concurrency comes from running several sessions at once, e.g. one
+``async_session_scope()`` per ``asyncio.gather`` task.
+"""
+from __future__ import annotations
+from datetime import datetime
+from typing import Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from eduschedule.domain.employee import Employee as domainEmployee
+from eduschedule.domain.schedule import Schedule as domainSchedule
+from eduschedule.domain.unavailability import Unavailability as domainUnavailability
+from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
+
+class _AsyncRepo:
+    _sync: type
+
+    def __init__(self, s: AsyncSession):
+        self.s = s
+
+    async def _run(self, method: str, *args, **kwargs) -> Any:
+        return await self.s.run_sync(lambda session: getattr(self._sync(session), method)(*args, **kwargs))
+
+class AsyncEmployeeRepo(_AsyncRepo):
+    _sync = EmployeeRepo
+
+    async def create(self, *, name: str, email: str, roleName: str | None, maxHours: int = 20) -> domainEmployee:
+        return await self._run("create", name=name, email=email, roleName=roleName, maxHours=maxHours)
+
+    async def getByEmail(self, email: str) -> domainEmployee | None:
+        return await self._run("getByEmail", email)
+
+    async def getById(self, id: int) -> domainEmployee | None:
+        return await self._run("getById", id)
+
+    async def list(self) -> list[domainEmployee]:
+        return await self._run("list")
+
+    async def listWithDetails(self, *, active_only: bool = True, compact: bool = False) -> list[domainEmployee]:
+        return await self._run("listWithDetails", active_only=active_only, compact=compact)
+
+    async def listForWindow(self, start: datetime, end: datetime, *, active_only: bool = True, role: str | None = None, compact: bool = False) -> list[domainEmployee]:
+        return await self._run("listForWindow", start, end, active_only=active_only, role=role, compact=compact)
+
+    async def freeBetween(self, start: datetime, end: datetime, *, role: str | None = None, min_remaining_hours: float | None = None) -> list[domainEmployee]:
+        return await self._run("freeBetween", start, end, role=role, min_remaining_hours=min_remaining_hours)
+
+    async def bookedSeconds(self) -> dict[int, float]:
+        return await self._run("bookedSeconds")
+
+class AsyncUnavailabilityRepo(_AsyncRepo):
+    _sync = UnavailabilityRepo
+
+    async def create(self, *, employeeId: int, startTime: datetime, endTime: datetime, note: str | None = None, checkOverlap: bool = True) -> domainUnavailability:
+        return await self._run("create", employeeId=employeeId, startTime=startTime, endTime=endTime, note=note, checkOverlap=checkOverlap)
+
+    async def getById(self, unavailabilityId: int) -> domainUnavailability | None:
+        return await self._run("getById", unavailabilityId)
+
+    async def viewUnavailabilities(self, employeeId: int) -> list[domainUnavailability]:
+        return await self._run("viewUnavailabilities", employeeId)
+
+    async def listUnavailabilitiesBetween(self, employeeId: int, start: datetime, end: datetime) -> list[domainUnavailability]:
+        return await self._run("listUnavailabilitiesBetween", employeeId, start, end)
+
+    async def conflicts(self, employeeId: int, startTime: datetime, endTime: datetime) -> bool:
+        return await self._run("conflicts", employeeId, startTime, endTime)
+
+class AsyncScheduleRepo(_AsyncRepo):
+    _sync = ScheduleRepo
+
+    async def create(self, *, employeeId: int, startTime: datetime, endTime: datetime, checkConflict: bool = True) -> domainSchedule:
+        return await self._run("create", employeeId=employeeId, startTime=startTime, endTime=endTime, checkConflict=checkConflict)
+
+    async def forEmployee(self, employeeId: int) -> list[domainSchedule]:
+        return await self._run("forEmployee", employeeId)
+
+    async def overlapping(self, employeeId: int, startTime: datetime, endTime: datetime) -> list[domainSchedule]:
+        return await self._run("overlapping", employeeId, startTime, endTime)
+
+    async def conflicts(self, employeeId: int, startTime: datetime, endTime: datetime) -> bool:
+        return await self._run("conflicts", employeeId, startTime, endTime)
+
+    async def unavailabilityConflict(self, employeeId: int, startTime: datetime, endTime: datetime) -> bool:
+        return await self._run("unavailabilityConflict", employeeId, startTime, endTime)
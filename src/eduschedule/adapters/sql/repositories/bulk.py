@@ -0,0 +1,12 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk write: rows written plus ``(input index, reason)`` for every rejected row."""
+    created: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    def merge(self, other: BulkResult) -> None:
+        self.created += other.created
+        self.errors.extend(other.errors)
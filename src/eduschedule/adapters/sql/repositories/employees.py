@@ -1,10 +1,27 @@
 from __future__ import annotations
-from sqlalchemy import select
-from sqlalchemy.orm import Session, selectinload
+from dataclasses import replace
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, Mapping
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, aliased, selectinload
+from eduschedule import profiling
 from eduschedule.domain.employee import Employee as domainEmployee
-from eduschedule.adapters.sql.models.employee import Employee as ormEmployee
-from eduschedule.adapters.sql.mappers import toDomainEmployee, updateRole
+from eduschedule.domain.intervals import IntervalArray
+from eduschedule.domain.schedule import Schedule as domainSchedule
+from eduschedule.domain.unavailability import Unavailability as domainUnavailability
+from eduschedule.adapters.sql.models.employee import Employee as ormEmployee, Role as roleObject
+from eduschedule.adapters.sql.models.schedule import Schedule as ormSchedule
+from eduschedule.adapters.sql.models.unavailability import Unavailability as ormUnavailability
+from eduschedule.adapters.sql.cache import cache, keyFor
+from eduschedule.adapters.sql.mappers import toDomainEmployee, toDomainEmployeeRow, toIntervalArrays, updateRole
+from eduschedule.adapters.sql.repositories.bulk import BulkResult
+from eduschedule.adapters.sql.sqlfuncs import durationSeconds, epochSeconds
 
+# Tables an employee read without intervals depends on (the role name comes from roles)
+_EMPLOYEE_TABLES = ("employees", "roles")
+
+@profiling.instrument
 class EmployeeRepo:
     def __init__(self, s: Session):
         self.s = s
@@ -19,23 +36,231 @@ class EmployeeRepo:
         self.s.commit()
         return toDomainEmployee(oEmployee)
     
+    def bulkCreate(self, rows: Iterable[Mapping], *, batchSize: int = 1000, commitBatches: bool = False) -> BulkResult:
+        """Insert employees from ``rows`` (``name``, ``email``, ``roleName``, ``maxHours``) in batches.
+
+        Rows are consumed lazily, ``batchSize`` at a time. Each batch costs one email lookup,
+        at most one role insert and one executemany insert; rows with a missing name/email or a
+        duplicate email are reported in the result instead of aborting the import. The caller
+        owns the transaction unless ``commitBatches`` is set.
+        """
+        if batchSize <= 0:
+            raise ValueError("batchSize must be positive")
+        result = BulkResult()
+        # Read fresh, not from the cache: roles created by another process must not be inserted again
+        roleIds: dict[str, int] = dict(self.s.execute(select(roleObject.name, roleObject.id)).all())
+        seenEmails: set[str] = set()
+        it = enumerate(rows)
+        while batch := list(islice(it, batchSize)):
+            result.merge(self._insertBatch(batch, roleIds, seenEmails))
+            if commitBatches:
+                self.s.commit()
+        return result
+
+    def _insertBatch(self, batch: list[tuple[int, Mapping]], roleIds: dict[str, int], seenEmails: set[str]) -> BulkResult:
+        result = BulkResult()
+        candidates: list[tuple[int, Mapping]] = []
+        for idx, row in batch:
+            if not row.get("name") or not row.get("email"):
+                result.errors.append((idx, "missing name or email"))
+            elif row["email"] in seenEmails:
+                result.errors.append((idx, f"duplicate email {row['email']} in input"))
+            else:
+                seenEmails.add(row["email"])
+                candidates.append((idx, row))
+        if not candidates:
+            return result
+
+        existing = set(self.s.scalars(select(ormEmployee.email).where(ormEmployee.email.in_([r["email"] for _, r in candidates]))))
+        valid = []
+        for idx, row in candidates:
+            if row["email"] in existing:
+                result.errors.append((idx, f"email {row['email']} already exists"))
+            else:
+                valid.append(row)
+
+        roleNames = {r.get("roleName").strip() for r in valid if r.get("roleName") and r.get("roleName").strip()}
+        newRoles = sorted(roleNames - roleIds.keys())
+        if newRoles:
+            # Another writer may have added some since the import started
+            roleIds.update(self.s.execute(select(roleObject.name, roleObject.id).where(roleObject.name.in_(newRoles))).all())
+            newRoles = [n for n in newRoles if n not in roleIds]
+        if newRoles:
+            self.s.execute(insert(roleObject), [{"name": n} for n in newRoles])
+            roleIds.update(self.s.execute(select(roleObject.name, roleObject.id).where(roleObject.name.in_(newRoles))).all())
+
+        payload = []
+        for row in valid:
+            roleName = (row.get("roleName") or "").strip()
+            payload.append({
+                "name": row["name"],
+                "email": row["email"],
+                "max_hours": 20 if row.get("maxHours") is None else row["maxHours"],
+                "active": True,
+                "role_id": roleIds[roleName] if roleName else None,
+            })
+        if payload:
+            self.s.execute(insert(ormEmployee), payload)
+        result.created = len(payload)
+        result.errors.sort()
+        return result
+
     def getByEmail(self, email: str) -> domainEmployee | None:
-        emp = self.s.scalar(select(ormEmployee).where(ormEmployee.email == email))
-        return toDomainEmployee(emp) if emp else None
+        emp = cache("employees").getOrLoad(keyFor(self.s, "email", email), _EMPLOYEE_TABLES, lambda: self._getOne(ormEmployee.email == email), session=self.s)
+        return _copy(emp) if emp else None
 
     def getById(self, id: int) -> domainEmployee | None:
-        emp = self.s.scalar(select(ormEmployee).where(ormEmployee.id == id))
-        return toDomainEmployee(emp) if emp else None
+        emp = cache("employees").getOrLoad(keyFor(self.s, "id", id), _EMPLOYEE_TABLES, lambda: self._getOne(ormEmployee.id == id), session=self.s)
+        return _copy(emp) if emp else None
     
     def list(self) -> list[domainEmployee]:
-        return self._list()
+        return [_copy(emp) for emp in cache("employees").getOrLoad(keyFor(self.s, "list"), _EMPLOYEE_TABLES, self._list, session=self.s)]
+
+    def _getOne(self, criterion) -> domainEmployee | None:
+        emp = self.s.scalar(select(ormEmployee).where(criterion))
+        return toDomainEmployee(emp) if emp else None
+
+    def iter(self, *, afterId: int | None = None, active_only: bool = False, batchSize: int = 1000) -> Iterator[domainEmployee]:
+        """Stream employees (without intervals) in id order using constant memory.
+
+        Rows are read in keyset pages of ``batchSize`` (``WHERE id > :last ORDER BY id LIMIT``),
+        each fetched completely before it is yielded, so no read stays open while the consumer
+        works and writers are not held up. ``afterId`` starts after that id; rows committed
+        meanwhile show up if their id is past the page being consumed.
+        """
+        if batchSize <= 0:
+            raise ValueError("batchSize must be positive")
+        stmt = (
+            select(ormEmployee.id, ormEmployee.name, ormEmployee.email, roleObject.name, ormEmployee.max_hours, ormEmployee.active)
+            .outerjoin(ormEmployee.role)
+            .order_by(ormEmployee.id)
+            .limit(batchSize)
+        )
+        if active_only:
+            stmt = stmt.where(ormEmployee.active.is_(True))
+        lastId = afterId
+        while True:
+            page = self.s.execute(stmt if lastId is None else stmt.where(ormEmployee.id > lastId)).all()
+            for row in page:
+                yield toDomainEmployeeRow(row)
+            if len(page) < batchSize:
+                return
+            lastId = page[-1][0]
 
     def listWithUnavailabilities(self) -> list[domainEmployee]:
         return self._list(with_unavailability=True)
 
-    def listWithDetails(self, *, active_only: bool = True) -> list[domainEmployee]:
+    def listWithDetails(self, *, active_only: bool = True, compact: bool = False) -> list[domainEmployee]:
+        """Employees with every unavailability and schedule.
+
+        With ``compact`` the intervals come back as :class:`IntervalArray` columns read straight
+        from the database as epoch seconds, without building ORM or domain objects per row.
+        """
+        if compact:
+            stmt = select(ormEmployee).order_by(ormEmployee.id)
+            if active_only:
+                stmt = stmt.where(ormEmployee.active.is_(True))
+            return self._listCompact(stmt)
         return self._list(with_unavailability=True, with_schedules=True, active_only=active_only)
 
+    def listForWindow(self, start: datetime, end: datetime, *, active_only: bool = True, role: str | None = None, compact: bool = False) -> list[domainEmployee]:
+        """Employees (optionally of one ``role``) with only the unavailabilities and schedules overlapping ``[start, end)`` loaded.
+
+        ``bookedSeconds`` carries the employee's total scheduled time, summed in SQL, so the
+        scheduler's capacity math matches ``listWithDetails`` without loading every schedule row.
+        ``compact`` returns the intervals as :class:`IntervalArray` columns.
+        """
+        if end <= start:
+            raise ValueError('End time must be after start time')
+        stmt = select(ormEmployee).order_by(ormEmployee.id)
+        if active_only:
+            stmt = stmt.where(ormEmployee.active.is_(True))
+        if role is not None:
+            stmt = stmt.join(ormEmployee.role).where(roleObject.name == role)
+        # Only sum the history of the employees being loaded
+        booked = self.bookedSeconds(stmt.with_only_columns(ormEmployee.id).order_by(None))
+        if compact:
+            return self._listCompact(stmt, window=(start, end), booked=booked)
+        stmt = stmt.options(
+            selectinload(ormEmployee.role),
+            selectinload(ormEmployee.unavailabilities.and_(ormUnavailability.start_utc < end, ormUnavailability.end_utc > start)),
+            selectinload(ormEmployee.schedules.and_(ormSchedule.start_utc < end, ormSchedule.end_utc > start)),
+        ).execution_options(populate_existing=True)
+        emps = self.s.scalars(stmt).all()
+        return [
+            toDomainEmployee(emp, withUnavailability=True, withSchedules=True, bookedSeconds=booked.get(emp.id, 0.0))
+            for emp in emps
+        ]
+
+    def freeBetween(self, start: datetime, end: datetime, *, role: str | None = None, min_remaining_hours: float | None = None) -> list[domainEmployee]:
+        """Active employees (optionally of one ``role``) with no schedule or unavailability overlapping ``[start, end)``.
+
+        Employees also need enough capacity left: ``min_remaining_hours`` if given, otherwise the
+        length of the window (as ``SchedulingProblem.free_employees``). Answered by one statement:
+        ``NOT EXISTS`` probes on the ``(employee_id, start_utc, end_utc)`` indexes and a grouped
+        sum of booked time, which comes back as ``bookedSeconds``.
+        """
+        if end <= start:
+            raise ValueError('End time must be after start time')
+        needed = (end - start).total_seconds() if min_remaining_hours is None else min_remaining_hours * 3600.0
+        busy = [
+            select(model.id).where(model.employee_id == ormEmployee.id, model.start_utc < end, model.end_utc > start).exists()
+            for model in (ormSchedule, ormUnavailability)
+        ]
+        # Grouping the joined schedules sums each survivor's booked time once, after the anti-joins
+        allSchedules = aliased(ormSchedule)
+        booked = func.coalesce(func.sum(durationSeconds(self.s, allSchedules.start_utc, allSchedules.end_utc)), 0.0)
+        stmt = (
+            select(ormEmployee.id, ormEmployee.name, ormEmployee.email, roleObject.name, ormEmployee.max_hours, ormEmployee.active, booked)
+            .outerjoin(ormEmployee.role)
+            .outerjoin(allSchedules, allSchedules.employee_id == ormEmployee.id)
+            .where(ormEmployee.active.is_(True), *(~probe for probe in busy))
+            .group_by(ormEmployee.id, roleObject.name)
+            .having(ormEmployee.max_hours * 3600.0 - booked >= needed - 1e-9)
+            .order_by(ormEmployee.id)
+        )
+        if role is not None:
+            stmt = stmt.where(roleObject.name == role)
+        emps = []
+        for row in self.s.execute(stmt):
+            emp = toDomainEmployeeRow(row[:6])
+            emp.bookedSeconds = float(row[6])
+            emps.append(emp)
+        return emps
+
+    def bookedSeconds(self, employeeIds=None) -> dict[int, float]:
+        """Total scheduled seconds per employee id, aggregated in the database.
+
+        ``employeeIds`` (ids or a select of ids) limits the sum to those employees.
+        """
+        stmt = select(ormSchedule.employee_id, func.sum(durationSeconds(self.s, ormSchedule.start_utc, ormSchedule.end_utc))).group_by(ormSchedule.employee_id)
+        if employeeIds is not None:
+            stmt = stmt.where(ormSchedule.employee_id.in_(employeeIds))
+        return {empId: float(total or 0.0) for empId, total in self.s.execute(stmt)}
+
+    def _listCompact(self, stmt, *, window: tuple[datetime, datetime] | None = None, booked: dict[int, float] | None = None) -> list[domainEmployee]:
+        emps = [
+            toDomainEmployee(emp, bookedSeconds=None if booked is None else booked.get(emp.id, 0.0))
+            for emp in self.s.scalars(stmt.options(selectinload(ormEmployee.role))).all()
+        ]
+        ids = stmt.with_only_columns(ormEmployee.id).order_by(None)
+        unvStmt = select(ormUnavailability.id, ormUnavailability.employee_id, epochSeconds(self.s, ormUnavailability.start_utc),
+                         epochSeconds(self.s, ormUnavailability.end_utc), ormUnavailability.note
+                         ).where(ormUnavailability.employee_id.in_(ids)).order_by(ormUnavailability.employee_id, ormUnavailability.start_utc)
+        schStmt = select(ormSchedule.id, ormSchedule.employee_id, epochSeconds(self.s, ormSchedule.start_utc),
+                         epochSeconds(self.s, ormSchedule.end_utc)
+                         ).where(ormSchedule.employee_id.in_(ids)).order_by(ormSchedule.employee_id, ormSchedule.start_utc)
+        if window is not None:
+            start, end = window
+            unvStmt = unvStmt.where(ormUnavailability.start_utc < end, ormUnavailability.end_utc > start)
+            schStmt = schStmt.where(ormSchedule.start_utc < end, ormSchedule.end_utc > start)
+        unvs = toIntervalArrays(self.s.execute(unvStmt), domainUnavailability)
+        schs = toIntervalArrays(self.s.execute(schStmt), domainSchedule)
+        for emp in emps:
+            emp.unavailabilities = unvs.get(emp.id) or IntervalArray(domainUnavailability)
+            emp.schedules = schs.get(emp.id) or IntervalArray(domainSchedule)
+        return emps
+
     def _list(
         self,
         *,
@@ -43,7 +268,7 @@ class EmployeeRepo:
         with_schedules: bool = False,
         active_only: bool = False,
     ) -> list[domainEmployee]:
-        stmt = select(ormEmployee).order_by(ormEmployee.id)
+        stmt = select(ormEmployee).order_by(ormEmployee.id).options(selectinload(ormEmployee.role))
         if active_only:
             stmt = stmt.where(ormEmployee.active.is_(True))
         if with_unavailability:
@@ -59,3 +284,8 @@ class EmployeeRepo:
             )
             for emp in emps
         ]
+
+
+def _copy(emp: domainEmployee) -> domainEmployee:
+    # Cached employees are shared between callers; hand out copies so they stay unmodified
+    return replace(emp, unavailabilities=[], schedules=[])
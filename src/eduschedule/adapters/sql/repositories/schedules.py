@@ -1,12 +1,23 @@
 from __future__ import annotations
-from datetime import datetime
-from sqlalchemy import select, and_
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+from sqlalchemy import DateTime, Integer, and_, column, exists, insert, or_, select, values
 from sqlalchemy.orm import Session
+from eduschedule import profiling
+from eduschedule.domain.coverage import CoverageSegment, coverage_gaps, coverage_gaps_by
+from eduschedule.domain.repair import RepairPlan
 from eduschedule.domain.schedule import Schedule as domainSchedule
+from eduschedule.adapters.sql.models.employee import Employee as ormEmployee, Role as roleObject
 from eduschedule.adapters.sql.models.schedule import Schedule as ormSchedule
 from eduschedule.adapters.sql.models.unavailability import Unavailability as ormUnavailability
 from eduschedule.adapters.sql.mappers import toDomainSchedule
+from eduschedule.adapters.sql.repositories.bulk import BulkResult
+from eduschedule.adapters.sql.sqlfuncs import epochSeconds
 
+# Rows per VALUES list in bulk conflict checks (4 bound parameters each, well under SQLite's limit)
+_CONFLICT_CHUNK = 2000
+
+@profiling.instrument
 class ScheduleRepo:
     def __init__(self, s: Session):
         self.s = s
@@ -26,10 +37,131 @@ class ScheduleRepo:
         self.s.flush()
         return toDomainSchedule(oSchedule)
 
+    def bulkCreate(self, schedules: Iterable[domainSchedule], *, checkConflict: bool = True) -> BulkResult:
+        """Insert many schedules at once, reporting every rejected entry instead of stopping at the first.
+
+        Entries are validated in Python (timezone, ordering, overlaps within the batch) and, with
+        ``checkConflict``, against stored schedules and unavailabilities by a set-based range join over
+        a VALUES list. Valid rows are then written with a single executemany.
+        """
+        result = BulkResult()
+        pending: list[tuple[int, domainSchedule]] = []
+        for idx, sch in enumerate(schedules):
+            if not _isAware(sch.startUTC) or not _isAware(sch.endUTC):
+                result.errors.append((idx, "start and end must be timezone-aware"))
+            elif sch.endUTC <= sch.startUTC:
+                result.errors.append((idx, "end must be after start"))
+            else:
+                pending.append((idx, sch))
+
+        accepted: list[tuple[int, domainSchedule]] = []
+        lastEnd: dict[int, datetime] = {}
+        for idx, sch in sorted(pending, key=lambda item: (item[1].employeeId, item[1].startUTC, item[0])):
+            if sch.employeeId in lastEnd and sch.startUTC < lastEnd[sch.employeeId]:
+                result.errors.append((idx, "overlaps another entry in the batch"))
+                continue
+            lastEnd[sch.employeeId] = sch.endUTC
+            accepted.append((idx, sch))
+
+        if checkConflict and accepted:
+            rejected = self.batchConflicts(accepted)
+            result.errors.extend(rejected.items())
+            accepted = [(idx, sch) for idx, sch in accepted if idx not in rejected]
+
+        accepted.sort(key=lambda item: item[0])
+        if accepted:
+            self.s.execute(insert(ormSchedule), [
+                {"employee_id": sch.employeeId, "start_utc": sch.startUTC, "end_utc": sch.endUTC}
+                for _, sch in accepted
+            ])
+        result.created = len(accepted)
+        result.errors.sort()
+        return result
+
+    def batchConflicts(self, entries: list[tuple[int, domainSchedule]]) -> dict[int, str]:
+        """Map each ``(key, schedule)`` entry that overlaps stored schedules or unavailabilities to a reason."""
+        conflicts: dict[int, str] = {}
+        for offset in range(0, len(entries), _CONFLICT_CHUNK):
+            chunk = entries[offset:offset + _CONFLICT_CHUNK]
+            batch = values(
+                column("idx", Integer),
+                column("employee_id", Integer),
+                column("start_utc", DateTime(timezone=True)),
+                column("end_utc", DateTime(timezone=True)),
+                name="batch",
+            ).data([(idx, sch.employeeId, sch.startUTC, sch.endUTC) for idx, sch in chunk]).cte()
+            schedHit = exists().where(and_(ormSchedule.employee_id == batch.c.employee_id,
+                ormSchedule.start_utc < batch.c.end_utc, ormSchedule.end_utc > batch.c.start_utc))
+            unvHit = exists().where(and_(ormUnavailability.employee_id == batch.c.employee_id,
+                ormUnavailability.start_utc < batch.c.end_utc, ormUnavailability.end_utc > batch.c.start_utc))
+            stmt = select(batch.c.idx, schedHit, unvHit).where(or_(schedHit, unvHit))
+            for idx, hitsSchedule, hitsUnavailability in self.s.execute(stmt):
+                conflicts[idx] = "conflicts with existing schedule" if hitsSchedule else "conflicts with unavailability"
+        return conflicts
+
     def forEmployee(self, employeeId: int) -> list[domainSchedule]:
         scheds = self.s.scalars(select(ormSchedule).where(ormSchedule.employee_id == employeeId).order_by(ormSchedule.start_utc))
         return [toDomainSchedule(i) for i in scheds]
 
+    def overlapping(self, employeeId: int, startTime: datetime, endTime: datetime) -> list[domainSchedule]:
+        stmt = select(ormSchedule).where(and_(ormSchedule.employee_id == employeeId, ormSchedule.start_utc < endTime, ormSchedule.end_utc > startTime)).order_by(ormSchedule.start_utc)
+        return [toDomainSchedule(i) for i in self.s.scalars(stmt)]
+
+    def coverageGaps(self, start: datetime, end: datetime, *, role: str | None = None, required: int = 1, batchSize: int = 1000) -> list[CoverageSegment[datetime]]:
+        """Parts of ``[start, end)`` staffed by fewer or more than ``required`` schedules (of ``role``'s employees, if given).
+
+        Schedules are streamed in ``start_utc`` order as epoch seconds, ``batchSize`` rows at a
+        time, through one sweep-line pass; memory grows with the number of gaps, not of schedules.
+        """
+        window = _epochWindow(start, end)
+        spans = ((s, e) for _, s, e in self._spans(start, end, role=role, batchSize=batchSize))
+        return [_segmentAt(seg) for seg in coverage_gaps(spans, *window, required=required)]
+
+    def coverageGapsByRole(self, start: datetime, end: datetime, *, required: int = 1, batchSize: int = 1000) -> dict[str | None, list[CoverageSegment[datetime]]]:
+        """:meth:`coverageGaps` for every role in one pass; roles nobody is scheduled for are one gap."""
+        roles = self.s.scalars(select(roleObject.name).order_by(roleObject.name)).all()
+        gaps = coverage_gaps_by(self._spans(start, end, batchSize=batchSize), *_epochWindow(start, end), keys=roles, required=required)
+        return {role: [_segmentAt(seg) for seg in segs] for role, segs in gaps.items()}
+
+    def _spans(self, start: datetime, end: datetime, *, role: str | None = None, batchSize: int = 1000) -> Iterator[tuple[str | None, int, int]]:
+        # ix_schedules_start_utc serves both the range and the order, so rows stream without a sort
+        stmt = (
+            select(roleObject.name, epochSeconds(self.s, ormSchedule.start_utc), epochSeconds(self.s, ormSchedule.end_utc))
+            .join(ormSchedule.employee)
+            .outerjoin(ormEmployee.role)
+            .where(ormSchedule.start_utc < end, ormSchedule.end_utc > start)
+            .order_by(ormSchedule.start_utc)
+            .execution_options(yield_per=batchSize)
+        )
+        if role is not None:
+            stmt = stmt.where(roleObject.name == role)
+        for row in self.s.execute(stmt):
+            yield tuple(row)
+
+    def delete(self, scheduleId: int) -> int:
+        sch = self.s.get(ormSchedule, scheduleId)
+        if not sch:
+            return 0
+        self.s.delete(sch)
+        return 1
+
+    def applyRepair(self, plan: RepairPlan) -> int:
+        """Persist only the rows a :class:`RepairPlan` touches; returns the number of rows written."""
+        for sch in plan.updated:
+            row = self.s.get(ormSchedule, sch.id)
+            if row is None:
+                raise ValueError(f"Schedule {sch.id} no longer exists")
+            row.start_utc = sch.startUTC
+            row.end_utc = sch.endUTC
+        for scheduleId in plan.deleted:
+            self.delete(scheduleId)
+        # Trimmed rows must be visible to the conflict check below
+        self.s.flush()
+        result = self.bulkCreate([*plan.split, *plan.reassigned])
+        if result.errors:
+            raise ValueError(f"Repair conflicts with stored data: {result.errors[0][1]}")
+        return len(plan.updated) + len(plan.deleted) + result.created
+
     def conflicts(self, employeeId: int, startTime: datetime, endTime: datetime) -> bool:
         stmt = select(ormSchedule).where(and_(ormSchedule.employee_id == employeeId, ormSchedule.start_utc < endTime, ormSchedule.end_utc > startTime)).limit(1)
         return self.s.scalar(stmt) is not None
@@ -37,3 +169,15 @@ class ScheduleRepo:
     def unavailabilityConflict(self, employeeId: int, startTime: datetime, endTime: datetime) -> bool:
         stmt = select(ormUnavailability).where(and_(ormUnavailability.employee_id == employeeId, ormUnavailability.start_utc < endTime, ormUnavailability.end_utc > startTime)).limit(1)
         return self.s.scalar(stmt) is not None
+
+
+def _epochWindow(start: datetime, end: datetime) -> tuple[int, int]:
+    if end <= start:
+        raise ValueError('End time must be after start time')
+    return int(start.timestamp()), int(end.timestamp())
+
+def _segmentAt(seg: CoverageSegment[int]) -> CoverageSegment[datetime]:
+    return CoverageSegment(datetime.fromtimestamp(seg.start, timezone.utc), datetime.fromtimestamp(seg.end, timezone.utc), seg.staffed)
+
+def _isAware(dt: datetime) -> bool:
+    return dt.tzinfo is not None and dt.tzinfo.utcoffset(dt) is not None
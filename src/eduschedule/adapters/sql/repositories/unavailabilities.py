@@ -1,11 +1,14 @@
 from __future__ import annotations
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_
 from datetime import datetime
+from typing import Iterator
 from sqlalchemy.orm import Session
+from eduschedule import profiling
 from eduschedule.domain.unavailability import Unavailability as domainUnavailability
 from eduschedule.adapters.sql.models.unavailability import Unavailability as ormUnavailability
 from eduschedule.adapters.sql.mappers import toDomainUnavailability
 
+@profiling.instrument
 class UnavailabilityRepo:
     def __init__(self, s: Session):
         self.s = s
@@ -26,6 +29,10 @@ class UnavailabilityRepo:
         self.s.commit()
         return toDomainUnavailability(oUnavailability)
     
+    def getById(self, unavailabilityId: int) -> domainUnavailability | None:
+        unv = self.s.get(ormUnavailability, unavailabilityId)
+        return toDomainUnavailability(unv) if unv else None
+
     def viewUnavailabilities(self, employeeId: int):
         unv = self.s.scalars(select(ormUnavailability)
                              .where(ormUnavailability.employee_id == employeeId)
@@ -39,6 +46,36 @@ class UnavailabilityRepo:
         unv = self.s.scalars(select(ormUnavailability).where(and_(ormUnavailability.employee_id == employeeId, ormUnavailability.start_utc >= start, ormUnavailability.start_utc <= end)).order_by(ormUnavailability.start_utc))
         return [toDomainUnavailability(i) for i in unv]
 
+    def iter(self, employeeId: int, start: datetime | None = None, end: datetime | None = None, *, batchSize: int = 1000) -> Iterator[domainUnavailability]:
+        """Stream an employee's unavailabilities by start time in keyset pages of ``batchSize`` rows.
+
+        Each page is read completely before it is yielded, so no read stays open while the
+        consumer works. With ``start`` and ``end`` only those starting within the range are
+        returned, as in ``listUnavailabilitiesBetween``.
+        """
+        if batchSize <= 0:
+            raise ValueError("batchSize must be positive")
+        stmt = (select(ormUnavailability)
+                .where(ormUnavailability.employee_id == employeeId)
+                .order_by(ormUnavailability.start_utc, ormUnavailability.id)
+                .limit(batchSize))
+        if start is not None and end is not None:
+            if end <= start:
+                raise ValueError('End time must be after start time')
+            stmt = stmt.where(ormUnavailability.start_utc >= start, ormUnavailability.start_utc <= end)
+        last = None
+        while True:
+            pageStmt = stmt
+            if last is not None:
+                pageStmt = stmt.where(or_(ormUnavailability.start_utc > last.start_utc,
+                                          and_(ormUnavailability.start_utc == last.start_utc, ormUnavailability.id > last.id)))
+            page = self.s.scalars(pageStmt).all()
+            for unv in page:
+                yield toDomainUnavailability(unv)
+            if len(page) < batchSize:
+                return
+            last = page[-1]
+
     def conflicts(self, employeeId: int, startTime: datetime, endTime: datetime) -> bool:
         test = (select(ormUnavailability).where(and_(ormUnavailability.employee_id == employeeId,
                 ormUnavailability.start_utc < endTime, ormUnavailability.end_utc > startTime)).limit(1))
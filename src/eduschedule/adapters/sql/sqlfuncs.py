@@ -0,0 +1,18 @@
+"""Dialect-aware SQL expressions shared by the repositories."""
+from __future__ import annotations
+from sqlalchemy import Integer, cast, func, literal_column
+from sqlalchemy.orm import Session
+
+def epochSeconds(session: Session, col):
+    """SQL expression for ``col`` as integer seconds since the Unix epoch."""
+    if session.get_bind().dialect.name == "sqlite":
+        return cast(func.strftime("%s", col), Integer)
+    return cast(func.extract("epoch", col), Integer)
+
+def durationSeconds(session: Session, startCol, endCol):
+    """SQL expression for ``endCol - startCol`` in seconds."""
+    if session.get_bind().dialect.name == "sqlite":
+        # julianday() works in fractional days; round away the float noise below a millisecond.
+        # Inline constants keep repeated uses identical, so SQLite computes a SUM over it only once.
+        return func.round((func.julianday(endCol) - func.julianday(startCol)) * literal_column("86400.0"), literal_column("3"))
+    return func.extract("epoch", endCol - startCol)
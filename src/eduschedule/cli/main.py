@@ -1,30 +1,42 @@
 import csv
+import json
 import os
 import subprocess
 import sys
+import time
+from itertools import islice
 from pathlib import Path
-from sqlalchemy import select
 import typer
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
-from eduschedule.adapters.sql.engine import session_scope
-from eduschedule.adapters.sql.mappers import localToUTC
-from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
-from eduschedule.adapters.sql.models.employee import Employee
-from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
+from eduschedule import profiling
+
+# SQLAlchemy, the models, repositories and the scheduler are imported inside the commands that
+# use them, so short commands (help, parse-roles, diagnostic) don't pay for them at startup.
 
 app = typer.Typer(help="EduSchedule CLI")
 
+@app.callback()
+def main(
+    profile: bool = typer.Option(False, "--profile", help="Print SQL, scheduler and repository timings on exit"),
+    profileJson: Path = typer.Option(None, "--profile-json", dir_okay=False, help="Also write the profile as a JSON trace to this file"),
+):
+    if profile or profileJson is not None:
+        profiling.enable(profileJson)
+
 @app.command("db-init")
 def dbInit():
-    result = subprocess.run(["alembic", "upgrade", "head"])
-    if result.returncode != 0:
+    from eduschedule.adapters.sql import migrations
+
+    try:
+        migrations.upgrade()
+    except Exception as exc:
         typer.echo(
-            "Alembic failed. Run 'alembic current/heads' to verify if DB schema is updated.",
+            f"Alembic failed ({exc}). Run 'alembic current/heads' to verify if DB schema is updated.",
             err=True,
         )
-        sys.exit(result.returncode)
+        sys.exit(1)
     typer.echo("Database migrated to head.")
 
 
@@ -38,6 +50,9 @@ def addEmployee(
     role: str | None = typer.Option(None, "--role", "-r", help="Role"),
     maxHours: int = typer.Option(20, "--max-hours", "-m", min=0, help="Max working hours/week"),
 ):
+    from eduschedule.adapters.sql.engine import session_scope
+    from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+
     if role is None or not role.strip():
         typer.secho("No role specified, will default to None.", fg="yellow")
         role = None
@@ -58,8 +73,13 @@ def addUnavailability(
     note: str | None = typer.Option(None, "--note", "-n", help="Note regarding unavailability (time off, sick, etc.)"),
     allowOverlap: bool = typer.Option(False, "--allow-overlap", "-o", help="prevents overlapping with existing availabilities (True/False)")
 ):
+    from eduschedule.adapters.sql.engine import session_scope
+    from eduschedule.adapters.sql.mappers import localToUTC
+    from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+    from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
+
     with session_scope() as s:
-        emp = s.scalar(select(Employee).where(Employee.id == employeeId))
+        emp = EmployeeRepo(s).getById(employeeId)
         if not emp:
             _fail(f"Employee not found at employee ID: {employeeId}")
         
@@ -70,13 +90,21 @@ def addUnavailability(
         typer.echo(f'Created unavailability [{startTime} -> {endTime} tz: {timeZone}] (id: {unv.id}) for employee {emp.name} (id: {emp.id})')
 
 @app.command("list-employees")
-def listEmployees():
+def listEmployees(
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format: table, csv or json"),
+    activeOnly: bool = typer.Option(False, "--active-only", help="Only list active employees"),
+):
+    from eduschedule.adapters.sql.engine import session_scope
+    from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+
+    _checkFormat(fmt)
     with session_scope() as s:
-        emps = EmployeeRepo(s).list()
-        for e in emps:
-            typer.echo(
-                f"{e.id}\t{e.name}\t{e.email}\trole: {e.role}\tmax hours: {e.maxHours}"
-            )
+        rows = (
+            {"id": e.id, "name": e.name, "email": e.email, "role": e.role, "maxHours": e.maxHours, "active": e.active}
+            for e in EmployeeRepo(s).iter(active_only=activeOnly)
+        )
+        _emitRows(rows, fmt, ["id", "name", "email", "role", "maxHours", "active"],
+                  lambda r: f"{r['id']}\t{r['name']}\t{r['email']}\trole: {r['role']}\tmax hours: {r['maxHours']}")
 
 @app.command("list-unavailabilities")
 def listUnavailabilities(
@@ -84,27 +112,116 @@ def listUnavailabilities(
     timeZone: str = typer.Option("America/New_York", "--time-zone", "-z", help="Local timezone"),
     startTime: str | None = typer.Option(None, "--start-time", "-st", help="Start of search range"),
     endTime: str | None = typer.Option(None, "--end-time", "-et", help="End of search range"),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format: table, csv or json"),
 ):
+    from sqlalchemy import select
+    from eduschedule.adapters.sql.engine import session_scope
+    from eduschedule.adapters.sql.mappers import localToUTC
+    from eduschedule.adapters.sql.models.employee import Employee
+    from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
+
+    _checkFormat(fmt)
     with session_scope() as s:
-        emp = s.scalar(select(Employee).where(Employee.id == employeeId))
+        emp = s.scalar(select(Employee.id).where(Employee.id == employeeId))
         if not emp:
             _fail(f"Employee not found at employee id: {employeeId}")
         if startTime and endTime:
             startUTC = localToUTC(_parseLocalTime(startTime), timeZone)
             endUTC = localToUTC(_parseLocalTime(endTime), timeZone)
-            unvs = UnavailabilityRepo(s).listUnavailabilitiesBetween(employeeId, startUTC, endUTC)
+            unvs = UnavailabilityRepo(s).iter(employeeId, startUTC, endUTC)
         elif startTime or endTime:
             _fail("Specify both start and end times")
         else:
-            unvs = UnavailabilityRepo(s).viewUnavailabilities(employeeId)
-        if not unvs:
-            typer.echo("No unavailabilities found")
-            return
+            unvs = UnavailabilityRepo(s).iter(employeeId)
         tz = ZoneInfo(timeZone)
-        for i in unvs:
-            startLocal = i.startUTC.astimezone(tz).strftime("%Y-%m-%d %H:%M")
-            endLocal = i.endUTC.astimezone(tz).strftime("%Y-%m-%d %H:%M")
-            typer.echo(f'{i.id}\t{startLocal} -> {endLocal}\tnote: {i.note}')
+        rows = (
+            {
+                "id": i.id,
+                "start": i.startUTC.astimezone(tz).strftime("%Y-%m-%d %H:%M"),
+                "end": i.endUTC.astimezone(tz).strftime("%Y-%m-%d %H:%M"),
+                "note": i.note,
+            }
+            for i in unvs
+        )
+        written = _emitRows(rows, fmt, ["id", "start", "end", "note"],
+                            lambda r: f"{r['id']}\t{r['start']} -> {r['end']}\tnote: {r['note']}")
+        if not written and fmt == "table":
+            typer.echo("No unavailabilities found")
+
+@app.command("free-employees", help="List active employees free for a whole time window")
+def freeEmployees(
+    startTime: str = typer.Option(..., "--start", "-s", help="Window start, e.g. '2025-09-01 08:00'"),
+    endTime: str = typer.Option(..., "--end", "-e", help="Window end"),
+    timeZone: str = typer.Option("America/New_York", "--time-zone", "-z", help="Local timezone"),
+    role: str | None = typer.Option(None, "--role", "-r", help="Only list employees with this role"),
+    minRemainingHours: float | None = typer.Option(None, "--min-remaining-hours", min=0, help="Capacity left that employees need (default: the window length)"),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format: table, csv or json"),
+):
+    from eduschedule.adapters.sql.engine import session_scope
+    from eduschedule.adapters.sql.mappers import localToUTC
+    from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+
+    _checkFormat(fmt)
+    startUTC = localToUTC(_parseLocalTime(startTime), timeZone)
+    endUTC = localToUTC(_parseLocalTime(endTime), timeZone)
+    if endUTC <= startUTC:
+        _fail("End time must be after start time")
+    with session_scope() as s:
+        emps = EmployeeRepo(s).freeBetween(startUTC, endUTC, role=role, min_remaining_hours=minRemainingHours)
+    rows = (
+        {"id": e.id, "name": e.name, "email": e.email, "role": e.role, "remainingHours": round(max(0.0, e.maxHours * 3600 - e.bookedSeconds) / 3600, 2)}
+        for e in emps
+    )
+    written = _emitRows(rows, fmt, ["id", "name", "email", "role", "remainingHours"],
+                        lambda r: f"{r['id']}\t{r['name']}\t{r['email']}\trole: {r['role']}\tremaining hours: {r['remainingHours']}")
+    if not written and fmt == "table":
+        typer.echo("No free employees found")
+
+@app.command("coverage-gaps", help="Report parts of a time window with nobody (or too many people) scheduled")
+def coverageGaps(
+    startTime: str = typer.Option(..., "--start", "-s", help="Window start, e.g. '2025-09-01 08:00'"),
+    endTime: str = typer.Option(..., "--end", "-e", help="Window end"),
+    timeZone: str = typer.Option("America/New_York", "--time-zone", "-z", help="Local timezone"),
+    role: str | None = typer.Option(None, "--role", "-r", help="Only count schedules of employees with this role"),
+    byRole: bool = typer.Option(False, "--by-role", help="Report every role separately"),
+    required: int = typer.Option(1, "--required", min=1, help="Schedules that should overlap at any moment"),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format: table, csv or json"),
+):
+    from eduschedule.adapters.sql.engine import session_scope
+    from eduschedule.adapters.sql.mappers import localToUTC
+    from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+
+    _checkFormat(fmt)
+    if byRole and role:
+        _fail("Use either --role or --by-role")
+    startUTC = localToUTC(_parseLocalTime(startTime), timeZone)
+    endUTC = localToUTC(_parseLocalTime(endTime), timeZone)
+    if endUTC <= startUTC:
+        _fail("End time must be after start time")
+    with session_scope() as s:
+        repo = ScheduleRepo(s)
+        if byRole:
+            gaps = [(r, seg) for r, segs in repo.coverageGapsByRole(startUTC, endUTC, required=required).items() for seg in segs]
+        else:
+            gaps = [(role, seg) for seg in repo.coverageGaps(startUTC, endUTC, role=role, required=required)]
+    tz = ZoneInfo(timeZone)
+    rows = (
+        {
+            "role": r,
+            "start": seg.start.astimezone(tz).strftime("%Y-%m-%d %H:%M"),
+            "end": seg.end.astimezone(tz).strftime("%Y-%m-%d %H:%M"),
+            "staffed": seg.staffed,
+            "status": "uncovered" if seg.staffed == 0 else "understaffed" if seg.staffed < required else "overstaffed",
+        }
+        for r, seg in gaps
+    )
+
+    def tableLine(r: dict) -> str:
+        line = f"{r['start']} -> {r['end']}\t{r['status']} ({r['staffed']} scheduled)"
+        return f"{r['role']}: {line}" if byRole else line
+    written = _emitRows(rows, fmt, ["role", "start", "end", "staffed", "status"], tableLine)
+    if not written and fmt == "table":
+        typer.echo(f"Fully covered by exactly {required} schedule{'s' if required > 1 else ''}")
 
 @app.command("parse-roles")
 def parseRoles(
@@ -132,27 +249,172 @@ def parseRoles(
 def importEmployees(
     csv_file: Path = typer.Argument(
         ..., exists=True, file_okay=True, dir_okay=False, readable=True, resolve_path=True, help="CSV file path"
-    )
+    ),
+    batchSize: int = typer.Option(1000, "--batch-size", "-b", min=1, help="Rows parsed and inserted per batch"),
+    commitBatches: bool = typer.Option(False, "--commit-batches", help="Commit after every batch instead of once at the end"),
 ):
-    """Read employees from *csv_file* and add them to the database."""
+    """Stream employees from *csv_file* into the database in batches."""
+    from eduschedule.adapters.sql.engine import session_scope
+    from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+
     with csv_file.open(newline="") as fh, session_scope() as s:
         reader = csv.DictReader(fh)
-        repo = EmployeeRepo(s)
-        added = 0
-        for row in reader:
-            name = row.get("name")
-            email = row.get("email")
-            if not name or not email:
-                continue
-            role = row.get("role") or None
-            max_hours_raw = row.get("max_hours") or row.get("maxHours")
+        result = EmployeeRepo(s).bulkCreate(
+            (_employeeRow(row) for row in reader), batchSize=batchSize, commitBatches=commitBatches
+        )
+    for idx, reason in result.errors:
+        # +2: CSV lines are 1-based and the header takes the first line
+        typer.secho(f"Skipped line {idx + 2}: {reason}", fg="yellow", err=True)
+    typer.echo(f"Imported {result.created} employees from {csv_file}")
+    if result.errors:
+        typer.echo(f"Skipped {len(result.errors)} rows")
+
+def _employeeRow(row: dict) -> dict:
+    max_hours_raw = row.get("max_hours") or row.get("maxHours")
+    try:
+        max_hours = int(max_hours_raw) if max_hours_raw else 20
+    except ValueError:
+        max_hours = 20
+    return {
+        "name": row.get("name"),
+        "email": row.get("email"),
+        "roleName": row.get("role") or None,
+        "maxHours": max_hours,
+    }
+
+@app.command("generate-schedule", help="Generate and store schedules covering a time window")
+def generateSchedule(
+    startTime: str = typer.Option(..., "--start", "-s", help="Window start, e.g. '2025-09-01 08:00'"),
+    endTime: str = typer.Option(..., "--end", "-e", help="Window end"),
+    timeZone: str = typer.Option("America/New_York", "--time-zone", "-z", help="Local timezone"),
+    slotMinutes: int = typer.Option(60, "--slot-minutes", min=1, help="Slot size in minutes"),
+    role: str | None = typer.Option(None, "--role", "-r", help="Only schedule employees with this role"),
+    mode: str = typer.Option("slots", "--mode", help="Scheduling mode: slots or runs"),
+    engine: str = typer.Option("python", "--engine", help="Slot engine: python or numpy"),
+    batchSize: int = typer.Option(1000, "--batch-size", "-b", min=1, help="Schedules inserted per batch"),
+    dryRun: bool = typer.Option(False, "--dry-run", help="Print the plan without saving it"),
+):
+    from eduschedule.adapters.sql.engine import session_scope
+    from eduschedule.adapters.sql.mappers import localToUTC
+    from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+    from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+    from eduschedule.domain.scheduler import SchedulingError, iter_schedule
+
+    startUTC = localToUTC(_parseLocalTime(startTime), timeZone)
+    endUTC = localToUTC(_parseLocalTime(endTime), timeZone)
+    if endUTC <= startUTC:
+        _fail("End time must be after start time")
+
+    with session_scope() as s:
+        t0 = time.perf_counter()
+        employees = EmployeeRepo(s).listForWindow(startUTC, endUTC, role=role)
+        if not employees:
+            _fail(f"No active employees found{f' with role {role}' if role else ''}")
+        t1 = time.perf_counter()
+        try:
+            stream = iter_schedule(
+                startUTC, endUTC, employees, slot_duration=timedelta(minutes=slotMinutes), mode=mode, engine=engine
+            )
+        except ImportError as exc:
+            _fail(str(exc))
+        except ValueError as exc:
+            _fail(f"Invalid scheduling options: {exc}")
+
+        # Solve and persist are interleaved batch by batch; time each side separately
+        tz = ZoneInfo(timeZone)
+        repo = ScheduleRepo(s)
+        solveSeconds = persistSeconds = 0.0
+        planned = 0
+        while True:
+            tb = time.perf_counter()
             try:
-                max_hours = int(max_hours_raw) if max_hours_raw else 20
-            except ValueError:
-                max_hours = 20
-            repo.create(name=name, email=email, roleName=role, maxHours=max_hours)
-            added += 1
-    typer.echo(f"Imported {added} employees from {csv_file}")
+                batch = list(islice(stream, batchSize))
+            except SchedulingError as exc:
+                _fail(f"{exc}; nothing saved")
+            tp = time.perf_counter()
+            solveSeconds += tp - tb
+            if not batch:
+                break
+            planned += len(batch)
+            if dryRun:
+                for entry in batch:
+                    startLocal = entry.startUTC.astimezone(tz).strftime("%Y-%m-%d %H:%M")
+                    endLocal = entry.endUTC.astimezone(tz).strftime("%Y-%m-%d %H:%M")
+                    typer.echo(f"{entry.employeeId}\t{startLocal} -> {endLocal}")
+            else:
+                result = repo.bulkCreate(batch)
+                if result.errors:
+                    idx, reason = result.errors[0]
+                    entry = batch[idx]
+                    _fail(f"Schedule for employee {entry.employeeId} at {entry.startUTC.isoformat()} rejected: {reason}; nothing saved")
+            persistSeconds += time.perf_counter() - tp
+        t2 = time.perf_counter()
+
+    action = "Planned" if dryRun else "Saved"
+    typer.echo(f"{action} {planned} schedules for {len(employees)} employees")
+    typer.echo(f"load: {t1 - t0:.3f}s  solve: {solveSeconds:.3f}s  persist: {persistSeconds + time.perf_counter() - t2:.3f}s")
+
+@app.command("repair-schedule", help="Reassign only the shifts blocked by an unavailability")
+def repairSchedule(
+    unavailabilityId: int = typer.Option(..., "--unavailability-id", "-u", help="Unavailability ID (as it appears in the database)"),
+    slotMinutes: int = typer.Option(60, "--slot-minutes", min=1, help="Slot size in minutes for reassigned time"),
+    anyRole: bool = typer.Option(False, "--any-role", help="Allow replacements from every role, not just the absent employee's"),
+    timeZone: str = typer.Option("America/New_York", "--time-zone", "-z", help="Local timezone for output"),
+):
+    from eduschedule.adapters.sql.engine import session_scope
+    from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+    from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+    from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
+    from eduschedule.domain.repair import plan_repair
+    from eduschedule.domain.scheduler import SchedulingError
+
+    with session_scope() as s:
+        unv = UnavailabilityRepo(s).getById(unavailabilityId)
+        if unv is None:
+            _fail(f"Unavailability not found at id: {unavailabilityId}")
+        scheduleRepo = ScheduleRepo(s)
+        affected = scheduleRepo.overlapping(unv.employeeId, unv.startUTC, unv.endUTC)
+        if not affected:
+            typer.echo("No scheduled shifts overlap this unavailability")
+            return
+        employeeRepo = EmployeeRepo(s)
+        absent = employeeRepo.getById(unv.employeeId)
+        windowStart = max(unv.startUTC, min(i.startUTC for i in affected))
+        windowEnd = min(unv.endUTC, max(i.endUTC for i in affected))
+        candidates = employeeRepo.listForWindow(windowStart, windowEnd, role=None if anyRole else absent.role)
+        try:
+            plan = plan_repair(unv, affected, candidates, slot_duration=timedelta(minutes=slotMinutes))
+        except (SchedulingError, ValueError) as exc:
+            _fail(f"Unable to repair schedule: {exc}")
+        written = scheduleRepo.applyRepair(plan)
+
+    tz = ZoneInfo(timeZone)
+    for entry in plan.reassigned:
+        startLocal = entry.startUTC.astimezone(tz).strftime("%Y-%m-%d %H:%M")
+        endLocal = entry.endUTC.astimezone(tz).strftime("%Y-%m-%d %H:%M")
+        typer.echo(f"{entry.employeeId}\t{startLocal} -> {endLocal}")
+    typer.echo(f"Repaired {len(affected)} shifts for employee {unv.employeeId}, {written} rows written")
+
+@app.command("serve", help="Run the scheduling service with a warm employee snapshot on a localhost HTTP port")
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind; keep it local, there is no authentication"),
+    port: int = typer.Option(8765, "--port", "-p", min=0, help="TCP port (0 picks a free one)"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Log every request"),
+):
+    from eduschedule.adapters.sql.migrations import SchemaNotCurrentError
+    from eduschedule.server import makeServer
+
+    try:
+        server = makeServer(host, port, verbose=verbose)
+    except (SchemaNotCurrentError, OSError) as exc:
+        _fail(f"Unable to start service: {exc}")
+    typer.echo(f"Serving on http://{host}:{server.server_port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
 @app.command("diagnostic")
 def statsForNerds():
@@ -161,12 +423,54 @@ def statsForNerds():
     typer.echo(
         f'Package importable, Database URL: {os.getenv("DATABASE_URL", DATABASE_URL)}'
     )
+    # Measured in a fresh interpreter so modules already imported by this process don't hide the cost
+    probe = (
+        "import time; t0 = time.perf_counter(); import eduschedule.cli.main; t1 = time.perf_counter(); "
+        "import eduschedule.adapters.sql.repositories.employees, eduschedule.adapters.sql.repositories.schedules; "
+        "print(t1 - t0, time.perf_counter() - t1)"
+    )
+    t0 = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    if result.returncode != 0:
+        typer.secho(f"Cold-start probe failed: {result.stderr.strip()}", fg="yellow", err=True)
+        return
+    cliImport, dbImport = (float(v) for v in result.stdout.split())
+    typer.echo(f"Cold start: {wall * 1000:.0f} ms (CLI import {cliImport * 1000:.0f} ms, database layer on first use {dbImport * 1000:.0f} ms)")
+
+_FORMATS = ("table", "csv", "json")
+
+def _checkFormat(fmt: str):
+    if fmt not in _FORMATS:
+        _fail(f"Unknown format {fmt!r}; choose one of {', '.join(_FORMATS)}")
+
+class _EchoWriter:
+    def write(self, text: str):
+        typer.echo(text, nl=False)
+
+def _emitRows(rows, fmt: str, columns: list[str], tableLine) -> int:
+    """Write dict rows as they arrive, so output never has to fit in memory; returns the row count."""
+    count = 0
+    writer = csv.DictWriter(_EchoWriter(), fieldnames=columns, lineterminator="\n") if fmt == "csv" else None
+    if writer:
+        writer.writeheader()
+    for row in rows:
+        if fmt == "table":
+            typer.echo(tableLine(row))
+        elif writer:
+            writer.writerow(row)
+        else:
+            typer.echo(("[" if count == 0 else ",") + json.dumps(row))
+        count += 1
+    if fmt == "json":
+        typer.echo("]" if count else "[]")
+    return count
 
 def _parseLocalTime(time: str) -> datetime: # Format: YYYY-MM-DD HH:MM or YYYY-MM-DDTHH:MM
     time = time.replace("T", " ")
     dt = datetime.fromisoformat(time)
     if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
-        typer.secho('Parsed time without timezone, interpreting as local time', fg="yellow")
+        typer.secho('Parsed time without timezone, interpreting as local time', fg="yellow", err=True)
     return dt
 
 def _fail(msg: str, code: int = 1):
@@ -2,4 +2,27 @@ from __future__ import annotations
 import os
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./eduschedule.db")
-TZ_DEFAULT = os.getenv("TZ_DEFAULT", "America/New_York")
\ No newline at end of file
+TZ_DEFAULT = os.getenv("TZ_DEFAULT", "America/New_York")
+
+# Connection pool settings for the process-wide engine (see adapters.sql.engine)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+
+# Opt-in instrumentation (see eduschedule.profiling): "1" prints a summary at exit, a path also writes a JSON trace
+PROFILE = os.getenv("EDUSCHEDULE_PROFILE", "")
+
+# SQLite connection tuning applied on connect (see adapters.sql.engine.SQLITE_PROFILES):
+# "default" keeps SQLite's own settings, "durable" and "throughput" enable WAL with different sync levels
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "default")
+# Per-pragma overrides on top of the profile, e.g. SQLITE_SYNCHRONOUS=NORMAL or SQLITE_MMAP_SIZE=0
+SQLITE_PRAGMAS = {
+    name: os.environ[f"SQLITE_{name.upper()}"]
+    for name in ("journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store", "busy_timeout")
+    if os.getenv(f"SQLITE_{name.upper()}")
+}
+
+# Read-through cache for employee and role lookups (see adapters.sql.cache); entries are also
+# invalidated whenever a session writes the tables they were read from. 0 for either disables it
+CACHE_SIZE = int(os.getenv("EDUSCHEDULE_CACHE_SIZE", "4096"))
+CACHE_TTL = float(os.getenv("EDUSCHEDULE_CACHE_TTL", "30"))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Generic, Hashable, Iterable, Iterator, TypeVar
+
+# Interval bounds: datetimes, or epoch seconds when streaming straight from the database
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+
+
+@dataclass(frozen=True, slots=True)
+class CoverageSegment(Generic[T]):
+    """A maximal part of a window during which exactly ``staffed`` schedules overlap."""
+
+    start: T
+    end: T
+    staffed: int
+
+
+class CoverageSweep(Generic[T]):
+    """Sweep line over half-open intervals fed in order of their start.
+
+    Only the ends of the intervals still open at the sweep position are kept
+    (in a heap), so memory is bounded by the peak overlap, not by the number
+    of intervals.  Parts of ``[start, end)`` staffed by fewer or more than
+    ``required`` intervals are reported as soon as the sweep has passed them;
+    adjacent parts with the same staffing are merged.
+    """
+
+    __slots__ = ("start", "end", "required", "_cursor", "_last", "_ends", "_pending")
+
+    def __init__(self, start: T, end: T, *, required: int = 1):
+        if not start < end:
+            raise ValueError("end must be after start")
+        if required < 1:
+            raise ValueError("required must be at least 1")
+        self.start = start
+        self.end = end
+        self.required = required
+        self._cursor = start
+        self._last: T | None = None
+        self._ends: list = []
+        self._pending: CoverageSegment[T] | None = None
+
+    def feed(self, start: T, end: T) -> list[CoverageSegment[T]]:
+        """Add ``[start, end)`` and return the segments the sweep has finished with."""
+        if self._last is not None and start < self._last:
+            raise ValueError("intervals must be fed in order of their start")
+        self._last = start
+        start, end = max(start, self.start), min(end, self.end)
+        if not start < end:
+            return []
+        out: list[CoverageSegment[T]] = []
+        self._advance(start, out)
+        heapq.heappush(self._ends, end)
+        return out
+
+    def close(self) -> list[CoverageSegment[T]]:
+        """Finish the window and return the remaining segments."""
+        out: list[CoverageSegment[T]] = []
+        self._advance(self.end, out)
+        if self._pending is not None:
+            self._report(self._pending, out)
+            self._pending = None
+        return out
+
+    def _advance(self, to: T, out: list[CoverageSegment[T]]) -> None:
+        ends = self._ends
+        while ends and ends[0] <= to:
+            self._emit(heapq.heappop(ends), len(ends) + 1, out)
+        self._emit(to, len(ends), out)
+
+    def _emit(self, to: T, staffed: int, out: list[CoverageSegment[T]]) -> None:
+        if not self._cursor < to:
+            return
+        pending = self._pending
+        if pending is not None and pending.staffed == staffed:
+            self._pending = CoverageSegment(pending.start, to, staffed)
+        else:
+            if pending is not None:
+                self._report(pending, out)
+            self._pending = CoverageSegment(self._cursor, to, staffed)
+        self._cursor = to
+
+    def _report(self, segment: CoverageSegment[T], out: list[CoverageSegment[T]]) -> None:
+        if segment.staffed != self.required:
+            out.append(segment)
+
+
+def coverage_gaps(
+    intervals: Iterable[tuple[T, T]], start: T, end: T, *, required: int = 1
+) -> Iterator[CoverageSegment[T]]:
+    """Yield the parts of ``[start, end)`` covered by fewer or more than ``required`` intervals.
+
+    ``intervals`` must be sorted by start and may be a lazy stream; it is read
+    once.  Segments with ``staffed == 0`` are uncovered, those above
+    ``required`` over-covered.
+    """
+    sweep = CoverageSweep(start, end, required=required)
+    for iv_start, iv_end in intervals:
+        yield from sweep.feed(iv_start, iv_end)
+    yield from sweep.close()
+
+
+def coverage_gaps_by(
+    keyed: Iterable[tuple[K, T, T]], start: T, end: T, *, keys: Iterable[K] = (), required: int = 1
+) -> dict[K, list[CoverageSegment[T]]]:
+    """Run :func:`coverage_gaps` separately per key (e.g. role) in a single pass over ``keyed``.
+
+    ``keyed`` yields ``(key, start, end)`` sorted by start.  Every key in
+    ``keys`` is reported even when no interval carries it (the whole window is
+    then a gap).
+    """
+    sweeps: dict[K, CoverageSweep[T]] = {key: CoverageSweep(start, end, required=required) for key in keys}
+    gaps: dict[K, list[CoverageSegment[T]]] = {key: [] for key in sweeps}
+    for key, iv_start, iv_end in keyed:
+        sweep = sweeps.get(key)
+        if sweep is None:
+            sweep = sweeps[key] = CoverageSweep(start, end, required=required)
+            gaps[key] = []
+        gaps[key].extend(sweep.feed(iv_start, iv_end))
+    for key, sweep in sweeps.items():
+        gaps[key].extend(sweep.close())
+    return gaps
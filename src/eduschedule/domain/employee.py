@@ -1,9 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List
+from typing import Sequence
 from .unavailability import Unavailability
 from .schedule import Schedule
-@dataclass
+@dataclass(slots=True)
 class Employee:
     id: int | None
     name: str
@@ -11,5 +11,8 @@ class Employee:
     role: str
     maxHours: int
     active: bool = True
-    unavailabilities: List[Unavailability] = field(default_factory=list)
-    schedules: List[Schedule] = field(default_factory=list)
+    # Plain lists, or an IntervalArray when loaded in compact form
+    unavailabilities: Sequence[Unavailability] = field(default_factory=list)
+    schedules: Sequence[Schedule] = field(default_factory=list)
+    # Total scheduled seconds when `schedules` only holds a time window (None: sum `schedules`)
+    bookedSeconds: float | None = None
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator
+
+from .schedule import Schedule
+from .unavailability import Unavailability
+
+Interval = tuple[datetime, datetime]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class IntervalSet:
+    """Sorted set of half-open ``[start, end)`` intervals.
+
+    Intervals are kept normalized: sorted by start, non-empty, and with
+    overlapping or touching intervals coalesced.  Because the normalized
+    intervals are disjoint, both the starts and the ends are sorted, which lets
+    :meth:`overlaps` answer with a single bisection in ``O(log n)``.
+    """
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self._starts: list = []
+        self._ends: list = []
+        for start, end in sorted(intervals, key=lambda iv: iv[0]):
+            if not start < end:
+                continue
+            if self._ends and start <= self._ends[-1]:
+                if end > self._ends[-1]:
+                    self._ends[-1] = end
+                continue
+            self._starts.append(start)
+            self._ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __iter__(self) -> Iterator[Interval]:
+        return zip(self._starts, self._ends)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)!r})"
+
+    def overlaps(self, start, end) -> bool:
+        """Return ``True`` if any interval intersects ``[start, end)``."""
+        idx = bisect_right(self._ends, start)
+        return idx < len(self._starts) and self._starts[idx] < end
+
+    def add(self, start, end) -> None:
+        """Merge ``[start, end)`` into the set in place.
+
+        Appending after the last interval, the common case for a forward
+        scheduling sweep, costs ``O(log n)``.
+        """
+        if not start < end:
+            return
+        lo = bisect_left(self._ends, start)
+        hi = bisect_right(self._starts, end)
+        if lo == hi:
+            self._starts.insert(lo, start)
+            self._ends.insert(lo, end)
+            return
+        new_start = min(start, self._starts[lo])
+        new_end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [new_start]
+        self._ends[lo:hi] = [new_end]
+
+    def union(self, other: Iterable[Interval]) -> IntervalSet:
+        """Return a new set covering both ``self`` and ``other``."""
+        return IntervalSet([*self, *other])
+
+    def subtract(self, other: Iterable[Interval]) -> IntervalSet:
+        """Return a new set with every point covered by ``other`` removed."""
+        removed = other if isinstance(other, IntervalSet) else IntervalSet(other)
+        result = IntervalSet()
+        cut_starts, cut_ends = removed._starts, removed._ends
+        for start, end in self:
+            idx = bisect_right(cut_ends, start)
+            cursor = start
+            while idx < len(cut_starts) and cut_starts[idx] < end:
+                if cut_starts[idx] > cursor:
+                    result._starts.append(cursor)
+                    result._ends.append(cut_starts[idx])
+                cursor = max(cursor, cut_ends[idx])
+                idx += 1
+            if cursor < end:
+                result._starts.append(cursor)
+                result._ends.append(end)
+        return result
+
+
+class IntervalArray(Sequence):
+    """Compact column store for many :class:`Schedule` or :class:`Unavailability` rows.
+
+    Ids, employee ids and bounds live in ``array('q')`` columns, with bounds as
+    int64 epoch seconds (sub-second precision is dropped).  Items are only
+    materialized as ``kind`` instances with UTC datetimes when accessed, so a
+    large history costs a few machine words per row instead of an object
+    graph.  Unavailability notes are kept sparsely.
+    """
+
+    __slots__ = ("kind", "_ids", "_employee_ids", "_starts", "_ends", "_notes")
+
+    def __init__(self, kind: type[Schedule] | type[Unavailability] = Schedule):
+        self.kind = kind
+        self._ids = array("q")
+        self._employee_ids = array("q")
+        self._starts = array("q")
+        self._ends = array("q")
+        self._notes: dict[int, str] = {}
+
+    @classmethod
+    def from_items(cls, items: Iterable[Schedule] | Iterable[Unavailability], kind=None) -> IntervalArray:
+        items = list(items)
+        arr = cls(kind or (type(items[0]) if items else Schedule))
+        for item in items:
+            arr.append(item)
+        return arr
+
+    def append(self, item: Schedule | Unavailability) -> None:
+        self.append_epoch(
+            item.id,
+            item.employeeId,
+            _to_epoch(item.startUTC),
+            _to_epoch(item.endUTC),
+            getattr(item, "note", None),
+        )
+
+    def append_epoch(self, id: int | None, employee_id: int, start: int, end: int, note: str | None = None) -> None:
+        if note is not None:
+            self._notes[len(self._ids)] = note
+        self._ids.append(-1 if id is None else id)
+        self._employee_ids.append(employee_id)
+        self._starts.append(start)
+        self._ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("IntervalArray index out of range")
+        row_id = self._ids[idx]
+        fields = dict(
+            id=None if row_id == -1 else row_id,
+            employeeId=self._employee_ids[idx],
+            startUTC=_from_epoch(self._starts[idx]),
+            endUTC=_from_epoch(self._ends[idx]),
+        )
+        if self.kind is Unavailability:
+            fields["note"] = self._notes.get(idx)
+        return self.kind(**fields)
+
+    def __repr__(self) -> str:
+        return f"IntervalArray({self.kind.__name__}, {len(self)} rows)"
+
+    def bounds(self) -> Iterator[Interval]:
+        """Yield ``(startUTC, endUTC)`` pairs without building row objects."""
+        for start, end in zip(self._starts, self._ends):
+            yield _from_epoch(start), _from_epoch(end)
+
+    def total_seconds(self) -> float:
+        return float(sum(self._ends) - sum(self._starts))
+
+
+def _to_epoch(dt: datetime) -> int:
+    return int((dt - _EPOCH).total_seconds())
+
+
+def _from_epoch(seconds: int) -> datetime:
+    return _EPOCH + timedelta(seconds=seconds)
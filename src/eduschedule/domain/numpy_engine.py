@@ -0,0 +1,85 @@
+"""Vectorized slot engine for :func:`~eduschedule.domain.scheduler.generate_schedule`.
+
+Importing this module registers the ``"numpy"`` engine.  The inputs are
+compiled into a slots × employees availability matrix so that finding the
+eligible employees for a slot is one boolean mask instead of a Python loop.
+Slots still have to be decided in order because every assignment changes the
+load vector the next decision is based on.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "The 'numpy' scheduling engine requires numpy (pip install 'eduschedule[fast]')"
+    ) from exc
+
+from .scheduler import Decision, _Workload, _slot_bounds, _unassignable, register_engine
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def assign_slots_numpy(
+    start: datetime,
+    end: datetime,
+    slot_duration: timedelta,
+    workload: _Workload,
+) -> Iterator[Decision]:
+    slots = _slot_bounds(start, end, slot_duration)
+    slot_starts = np.array([_epoch_us(s) for s, _ in slots], dtype=np.int64)
+    slot_ends = np.array([_epoch_us(e) for _, e in slots], dtype=np.int64)
+    slot_seconds = [(e - s).total_seconds() for s, e in slots]
+
+    available = _availability_matrix(slot_starts, slot_ends, workload)
+    existing = np.array(workload.existing_seconds, dtype=np.float64)
+    capacity = np.array(workload.capacity_seconds, dtype=np.float64)
+    assigned = np.array(workload.assigned_seconds, dtype=np.float64)
+
+    for slot_idx, (slot_start, slot_end) in enumerate(slots):
+        seconds = slot_seconds[slot_idx]
+        mask = available[slot_idx] & (capacity - assigned >= seconds - 1e-9)
+        if not mask.any():
+            raise _unassignable(slot_start, slot_end)
+
+        # Lexicographic argmin over (existing + assigned, assigned, index).
+        load = np.where(mask, existing + assigned, np.inf)
+        mask &= load == load.min()
+        if np.count_nonzero(mask) > 1:
+            tie_break = np.where(mask, assigned, np.inf)
+            mask &= tie_break == tie_break.min()
+        chosen_idx = int(np.argmax(mask))
+
+        assigned[chosen_idx] += seconds
+        yield workload.assign(chosen_idx, slot_start, slot_end)
+
+
+def _availability_matrix(slot_starts, slot_ends, workload: _Workload):
+    available = np.zeros((len(slot_starts), len(workload.active)), dtype=bool)
+    for idx, busy in enumerate(workload.busy):
+        if not workload.active[idx]:
+            continue
+        available[:, idx] = True
+        if not busy:
+            continue
+        busy_starts = np.array([_epoch_us(s) for s, _ in busy], dtype=np.int64)
+        busy_ends = np.array([_epoch_us(e) for _, e in busy], dtype=np.int64)
+        # Slots overlapping a busy interval form the contiguous index range
+        # [first slot ending after it starts, first slot starting at/after its end).
+        first = np.searchsorted(slot_ends, busy_starts, side="right")
+        stop = np.searchsorted(slot_starts, busy_ends, side="left")
+        for lo, hi in zip(first.tolist(), stop.tolist()):
+            if lo < hi:
+                available[lo:hi, idx] = False
+    return available
+
+
+def _epoch_us(dt: datetime) -> int:
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+register_engine("numpy", assign_slots_numpy)
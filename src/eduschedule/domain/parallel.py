@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Hashable, Sequence
+
+from .employee import Employee
+from .schedule import Schedule
+from .scheduler import SchedulingError, generate_schedule
+from .unavailability import Unavailability
+
+# (id, maxHours, active, bookedSeconds, unavailability bounds, schedule bounds)
+_PackedEmployee = tuple[int, int, bool, "float | None", tuple, tuple]
+
+
+@dataclass
+class PartitionedSchedule:
+    """Result of :func:`generate_schedule_partitioned`."""
+
+    schedules: list[Schedule] = field(default_factory=list)
+    partitions: dict[Hashable, list[Schedule]] = field(default_factory=dict)
+    errors: dict[Hashable, SchedulingError] = field(default_factory=dict)
+
+
+def generate_schedule_partitioned(
+    start: datetime,
+    end: datetime,
+    employees: Sequence[Employee],
+    *,
+    key: Callable[[Employee], Hashable] | None = None,
+    slot_duration: timedelta = timedelta(hours=1),
+    mode: str = "slots",
+    engine: str = "python",
+    max_workers: int | None = None,
+) -> PartitionedSchedule:
+    """Solve independent employee partitions of ``[start, end)`` in parallel.
+
+    Employees are grouped by ``key`` (their role by default) and every group
+    gets its own :func:`~eduschedule.domain.scheduler.generate_schedule` call
+    covering the whole window, run in a process pool.  Only the fields the
+    scheduler reads are shipped to the workers.
+
+    A partition that cannot be covered is recorded in ``errors`` without
+    affecting the others.  Partitions are merged in sorted key order and the
+    combined ``schedules`` list is ordered by start time, then employee id, so
+    the result does not depend on which worker finishes first.
+    """
+    if not employees:
+        raise ValueError("At least one employee is required to generate a schedule.")
+    key = key or (lambda emp: emp.role)
+
+    groups: dict[Hashable, list[_PackedEmployee]] = {}
+    for emp in employees:
+        groups.setdefault(key(emp), []).append(_pack(emp))
+    ordered = sorted(groups, key=lambda k: (k is None, str(k)))
+    options = {"slot_duration": slot_duration, "mode": mode, "engine": engine}
+
+    outcomes: dict[Hashable, Any] = {}
+    if len(ordered) == 1 or max_workers == 1:
+        for part in ordered:
+            outcomes[part] = _run_inline(start, end, groups[part], options)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {part: pool.submit(_solve_partition, start, end, groups[part], options) for part in ordered}
+            for part in ordered:
+                try:
+                    outcomes[part] = futures[part].result()
+                except SchedulingError as exc:
+                    outcomes[part] = exc
+
+    result = PartitionedSchedule()
+    for part in ordered:
+        outcome = outcomes[part]
+        if isinstance(outcome, SchedulingError):
+            result.errors[part] = outcome
+            continue
+        schedules = [Schedule(id=None, employeeId=emp_id, startUTC=s, endUTC=e) for emp_id, s, e in outcome]
+        result.partitions[part] = schedules
+        result.schedules.extend(schedules)
+    result.schedules.sort(key=lambda s: (s.startUTC, s.employeeId))
+    return result
+
+
+def _pack(emp: Employee) -> _PackedEmployee:
+    return (
+        emp.id,
+        emp.maxHours,
+        emp.active,
+        emp.bookedSeconds,
+        tuple((u.startUTC, u.endUTC) for u in emp.unavailabilities),
+        tuple((s.startUTC, s.endUTC) for s in emp.schedules),
+    )
+
+
+def _unpack(packed: _PackedEmployee) -> Employee:
+    emp_id, max_hours, active, booked, unavailable, scheduled = packed
+    return Employee(
+        id=emp_id,
+        name="",
+        email="",
+        role="",
+        maxHours=max_hours,
+        active=active,
+        unavailabilities=[Unavailability(id=None, employeeId=emp_id, startUTC=s, endUTC=e) for s, e in unavailable],
+        schedules=[Schedule(id=None, employeeId=emp_id, startUTC=s, endUTC=e) for s, e in scheduled],
+        bookedSeconds=booked,
+    )
+
+
+def _solve_partition(
+    start: datetime,
+    end: datetime,
+    packed: list[_PackedEmployee],
+    options: dict[str, Any],
+) -> list[tuple[int, datetime, datetime]]:
+    schedules = generate_schedule(start, end, [_unpack(p) for p in packed], **options)
+    return [(s.employeeId, s.startUTC, s.endUTC) for s in schedules]
+
+
+def _run_inline(start, end, packed, options):
+    try:
+        return _solve_partition(start, end, packed, options)
+    except SchedulingError as exc:
+        return exc
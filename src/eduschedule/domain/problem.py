@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Collection, Iterable, Sequence
+
+from .employee import Employee
+from .schedule import Schedule
+from .scheduler import SchedulingError, _check_window, _solve, _Workload
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One what-if question for :meth:`SchedulingProblem.solve_many`."""
+
+    start: datetime
+    end: datetime
+    slot_duration: timedelta = timedelta(hours=1)
+    exclude: Collection[int] = field(default_factory=frozenset)
+    mode: str = "slots"
+    engine: str = "python"
+
+
+class SchedulingProblem:
+    """An employee set compiled once for repeated scheduling runs.
+
+    Busy time is merged into sorted :class:`~eduschedule.domain.intervals.IntervalSet`
+    indexes and the booked time and remaining capacity of every employee are
+    computed up front, so each :meth:`solve` only validates its window and
+    runs the engine.  Every solve starts from the same compiled state; results
+    are identical to calling
+    :func:`~eduschedule.domain.scheduler.generate_schedule` with the same
+    employees (minus any excluded ones).
+    """
+
+    __slots__ = ("employee_ids", "_index", "_compiled")
+
+    def __init__(self, employees: Sequence[Employee]):
+        if not employees:
+            raise ValueError("At least one employee is required to generate a schedule.")
+        for emp in employees:
+            if emp.id is None:
+                raise ValueError("All employees must have an id before scheduling")
+        self.employee_ids = [emp.id for emp in employees]
+        self._index = {emp_id: idx for idx, emp_id in enumerate(self.employee_ids)}
+        self._compiled = _Workload.build(employees)
+
+    def __len__(self) -> int:
+        return len(self.employee_ids)
+
+    def solve(
+        self,
+        start: datetime,
+        end: datetime,
+        slot_duration: timedelta = timedelta(hours=1),
+        *,
+        exclude: Collection[int] = (),
+        mode: str = "slots",
+        engine: str = "python",
+    ) -> list[Schedule]:
+        """Schedule ``[start, end)`` without the employees whose ids are in ``exclude``.
+
+        Raises :class:`~eduschedule.domain.scheduler.SchedulingError` when the
+        window cannot be covered.
+        """
+        start, end, slot_duration, assign_slots = _check_window(start, end, slot_duration, mode, engine)
+        workload = self._workload(exclude)
+        return list(_solve(start, end, slot_duration, mode, assign_slots, workload, self.employee_ids))
+
+    def free_employees(self, start: datetime, end: datetime, *, exclude: Collection[int] = ()) -> list[int]:
+        """Ids of active employees with no busy time in ``[start, end)`` and capacity to cover it."""
+        if end <= start:
+            raise ValueError("end must be after start")
+        seconds = (end - start).total_seconds()
+        workload = self._workload(exclude)
+        return [
+            self.employee_ids[idx]
+            for idx, active in enumerate(workload.active)
+            if active and workload.remaining(idx) >= seconds - 1e-9 and not workload.busy[idx].overlaps(start, end)
+        ]
+
+    def remaining_seconds(self, employee_id: int) -> float:
+        """Capacity left for ``employee_id`` before any solve."""
+        return self._compiled.remaining(self._index[employee_id])
+
+    def solve_many(self, scenarios: Iterable[Scenario]) -> list[list[Schedule] | SchedulingError]:
+        """Solve each scenario in turn.
+
+        The result lines up with ``scenarios``; a scenario that cannot be
+        covered yields its :class:`~eduschedule.domain.scheduler.SchedulingError`
+        instead of a schedule list, without stopping the others.
+        """
+        results: list[list[Schedule] | SchedulingError] = []
+        for sc in scenarios:
+            try:
+                results.append(
+                    self.solve(sc.start, sc.end, sc.slot_duration, exclude=sc.exclude, mode=sc.mode, engine=sc.engine)
+                )
+            except SchedulingError as exc:
+                results.append(exc)
+        return results
+
+    def _workload(self, exclude: Collection[int]) -> _Workload:
+        compiled = self._compiled
+        active = compiled.active
+        if exclude:
+            unknown = [emp_id for emp_id in exclude if emp_id not in self._index]
+            if unknown:
+                raise ValueError(f"Unknown employee ids in exclude: {sorted(unknown)}")
+            if len(set(exclude)) == len(self.employee_ids):
+                raise ValueError("At least one employee is required to generate a schedule.")
+            active = list(active)
+            for emp_id in exclude:
+                active[self._index[emp_id]] = False
+        # Engines only write assigned_seconds; the compiled indexes are shared.
+        return _Workload(
+            active=active,
+            busy=compiled.busy,
+            existing_seconds=compiled.existing_seconds,
+            capacity_seconds=compiled.capacity_seconds,
+            assigned_seconds=[0.0] * len(self.employee_ids),
+        )
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Sequence
+
+from .employee import Employee
+from .schedule import Schedule
+from .scheduler import generate_schedule
+from .unavailability import Unavailability
+
+
+@dataclass
+class RepairPlan:
+    """Row-level changes that make a plan respect a new unavailability.
+
+    ``updated`` holds existing rows (ids kept) trimmed around the
+    unavailability, ``deleted`` the ids of rows it covers entirely, ``split``
+    the new rows for the tail of any shift it cuts in two, and ``reassigned``
+    the replacement coverage for the blocked gaps.
+    """
+
+    updated: list[Schedule] = field(default_factory=list)
+    deleted: list[int] = field(default_factory=list)
+    split: list[Schedule] = field(default_factory=list)
+    reassigned: list[Schedule] = field(default_factory=list)
+
+
+def plan_repair(
+    unavailability: Unavailability,
+    affected: Sequence[Schedule],
+    candidates: Sequence[Employee],
+    *,
+    slot_duration: timedelta = timedelta(hours=1),
+    mode: str = "slots",
+) -> RepairPlan:
+    """Reassign only the parts of ``affected`` that ``unavailability`` now blocks.
+
+    ``affected`` are the unavailable employee's schedules overlapping the new
+    unavailability.  Each one is trimmed (or split) around it, and every
+    blocked gap is re-solved with
+    :func:`~eduschedule.domain.scheduler.generate_schedule` over
+    ``candidates`` (the unavailable employee is always excluded), so the usual
+    balancing rules pick the replacements.  Gaps are solved in time order and
+    each one sees the assignments made for the previous ones.
+
+    Raises :class:`~eduschedule.domain.scheduler.SchedulingError` when a gap
+    cannot be covered; nothing is planned in that case.
+    """
+    plan = RepairPlan()
+    gaps: list[tuple[datetime, datetime]] = []
+    for sch in sorted(affected, key=lambda s: s.startUTC):
+        gap_start = max(sch.startUTC, unavailability.startUTC)
+        gap_end = min(sch.endUTC, unavailability.endUTC)
+        if gap_start >= gap_end:
+            continue
+        gaps.append((gap_start, gap_end))
+        pieces = [(sch.startUTC, gap_start), (gap_end, sch.endUTC)]
+        pieces = [(s, e) for s, e in pieces if s < e]
+        if not pieces:
+            plan.deleted.append(sch.id)
+            continue
+        head, *tail = pieces
+        plan.updated.append(replace(sch, startUTC=head[0], endUTC=head[1]))
+        for s, e in tail:
+            plan.split.append(Schedule(id=None, employeeId=sch.employeeId, startUTC=s, endUTC=e))
+
+    pool = [emp for emp in candidates if emp.id != unavailability.employeeId]
+    if gaps and not pool:
+        raise ValueError("At least one other employee is required to repair a schedule.")
+    for gap_start, gap_end in gaps:
+        filled = generate_schedule(gap_start, gap_end, pool, slot_duration=slot_duration, mode=mode)
+        plan.reassigned.extend(filled)
+        pool = [_with_assignments(emp, [s for s in filled if s.employeeId == emp.id]) for emp in pool]
+    return plan
+
+
+def _with_assignments(emp: Employee, added: list[Schedule]) -> Employee:
+    if not added:
+        return emp
+    booked = emp.bookedSeconds
+    if booked is not None:
+        booked += sum((s.endUTC - s.startUTC).total_seconds() for s in added)
+    return replace(emp, schedules=[*emp.schedules, *added], bookedSeconds=booked)
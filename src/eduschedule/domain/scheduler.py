@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Iterable, Sequence
+import importlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator, Sequence
+
+from eduschedule import profiling
 
 from .employee import Employee
+from .intervals import IntervalArray, IntervalSet
 from .schedule import Schedule
+from .selection import CandidateQueue
+
+SCHEDULING_MODES = ("slots", "runs")
 
 
 class SchedulingError(ValueError):
@@ -17,6 +25,8 @@ def generate_schedule(
     employees: Sequence[Employee],
     *,
     slot_duration: timedelta = timedelta(hours=1),
+    mode: str = "slots",
+    engine: str = "python",
 ) -> list[Schedule]:
     """Generate schedules covering ``[start, end)``.
 
@@ -28,20 +38,77 @@ def generate_schedule(
     * every slot must be handled by exactly one employee
     * assignments are balanced so the total workload stays evenly distributed
 
+    With ``mode="runs"`` the window is not walked slot by slot.  Instead it is
+    cut at every breakpoint where someone's availability changes (the edges of
+    unavailabilities and existing schedules) and each run between breakpoints
+    is handed out in one decision, using the same balancing rules.  A run is
+    split further only where the chosen employee's capacity runs out, so the
+    work is proportional to the number of availability events rather than to
+    the horizon length; ``slot_duration`` is ignored in this mode.
+
+    In slot mode the per-slot selection is delegated to a registered
+    ``engine`` (see :func:`register_engine`).  ``"python"`` is the default;
+    ``"numpy"`` compiles the inputs into an availability matrix and picks
+    candidates with vectorized masking.  Every engine returns the same
+    schedule.
+
     The function returns a list of :class:`~eduschedule.domain.schedule.Schedule`
     objects (with ``id`` set to ``None``).  Consecutive slots assigned to the same
     employee are merged into a single schedule entry.
     """
+    return list(
+        iter_schedule(start, end, employees, slot_duration=slot_duration, mode=mode, engine=engine)
+    )
+
+
+def iter_schedule(
+    start: datetime,
+    end: datetime,
+    employees: Sequence[Employee],
+    *,
+    slot_duration: timedelta = timedelta(hours=1),
+    mode: str = "slots",
+    engine: str = "python",
+) -> Iterator[Schedule]:
+    """Lazily yield the schedules :func:`generate_schedule` would return.
+
+    Arguments are validated immediately; the plan itself is produced as the
+    iterator is consumed.  Each merged :class:`~eduschedule.domain.schedule.Schedule`
+    is yielded in start-time order as soon as its employee's run is closed by
+    the next decision, so memory does not grow with the horizon (the
+    ``"numpy"`` engine excepted, as it materializes its slot matrix) and long
+    plans can be fed to persistence or export while planning continues.  A
+    :class:`SchedulingError` surfaces when the first uncoverable slot is
+    reached, after every run closed before it has been yielded.
+    """
+
+    with profiling.phase("scheduler.validate"):
+        if not employees:
+            raise ValueError("At least one employee is required to generate a schedule.")
+
+        for emp in employees:
+            if emp.id is None:
+                raise ValueError("All employees must have an id before scheduling")
 
-    if not employees:
-        raise ValueError("At least one employee is required to generate a schedule.")
+        start, end, slot_duration, assign_slots = _check_window(start, end, slot_duration, mode, engine)
+    with profiling.phase("scheduler.index"):
+        workload = _Workload.build(employees)
+    return _solve(start, end, slot_duration, mode, assign_slots, workload, [emp.id for emp in employees])
 
+
+def _check_window(
+    start: datetime,
+    end: datetime,
+    slot_duration: timedelta,
+    mode: str,
+    engine: str,
+) -> tuple[datetime, datetime, timedelta, SlotEngine]:
     if not _is_timezone_aware(start) or not _is_timezone_aware(end):
         raise ValueError("start and end must be timezone-aware datetimes")
 
-    for emp in employees:
-        if emp.id is None:
-            raise ValueError("All employees must have an id before scheduling")
+    # Aware datetimes sharing a tzinfo compare and add by wall-clock time, which
+    # drifts across DST changes; every engine works on absolute UTC instants.
+    start, end = start.astimezone(timezone.utc), end.astimezone(timezone.utc)
 
     if end <= start:
         raise ValueError("end must be after start")
@@ -49,73 +116,222 @@ def generate_schedule(
     if slot_duration <= timedelta(0):
         raise ValueError("slot_duration must be positive")
 
+    if mode not in SCHEDULING_MODES:
+        raise ValueError(f"mode must be one of {', '.join(SCHEDULING_MODES)}")
+
+    if mode == "runs" and engine != "python":
+        raise ValueError("engine only applies to mode='slots'")
+    assign_slots = get_engine(engine)
+
     total_duration = end - start
     if slot_duration > total_duration:
         slot_duration = total_duration
+    return start, end, slot_duration, assign_slots
 
-    busy_by_employee = [_build_busy_intervals(emp) for emp in employees]
-    existing_seconds = [
-        sum(_duration_seconds(s.startUTC, s.endUTC) for s in emp.schedules)
-        for emp in employees
-    ]
-    assigned_seconds = [0.0] * len(employees)
-    capacity_seconds = [
-        max(0.0, float(emp.maxHours) * 3600.0 - existing)
-        for emp, existing in zip(employees, existing_seconds, strict=True)
-    ]
-    assignments: list[list[tuple[datetime, datetime]]] = [[] for _ in employees]
 
-    current_start = start
-    order = list(range(len(employees)))
+def _solve(
+    start: datetime,
+    end: datetime,
+    slot_duration: timedelta,
+    mode: str,
+    assign_slots: SlotEngine,
+    workload: _Workload,
+    employee_ids: list[int],
+) -> Iterator[Schedule]:
+    if mode == "runs":
+        decisions = _assign_runs(start, end, workload)
+    else:
+        decisions = assign_slots(start, end, slot_duration, workload)
+    decisions = profiling.timed_iter(f"scheduler.{mode}_loop", decisions)
+    return profiling.timed_iter("scheduler.merge", _merge_runs(decisions, employee_ids))
+
+
+def _merge_runs(
+    decisions: Iterable[tuple[int, datetime, datetime]],
+    employee_ids: list[int],
+) -> Iterator[Schedule]:
+    # Decisions tile the window in time order, so at most one employee has an
+    # open run: it is closed as soon as a decision goes to someone else.
+    open_idx: int | None = None
+    open_start = open_end = None
+    for idx, start_time, end_time in decisions:
+        if idx == open_idx and start_time == open_end:
+            open_end = end_time
+            continue
+        if open_idx is not None:
+            yield Schedule(id=None, employeeId=employee_ids[open_idx], startUTC=open_start, endUTC=open_end)
+        open_idx, open_start, open_end = idx, start_time, end_time
+    if open_idx is not None:
+        yield Schedule(id=None, employeeId=employee_ids[open_idx], startUTC=open_start, endUTC=open_end)
+
+
+Decision = tuple[int, datetime, datetime]
+SlotEngine = Callable[[datetime, datetime, timedelta, "_Workload"], Iterator[Decision]]
+
+_ENGINES: dict[str, SlotEngine] = {}
+# Engines with optional dependencies register themselves when first requested.
+_LAZY_ENGINES = {"numpy": "eduschedule.domain.numpy_engine"}
+
+
+def register_engine(name: str, engine: SlotEngine) -> None:
+    """Make ``engine`` selectable through ``generate_schedule(engine=name)``.
+
+    An engine receives ``(start, end, slot_duration, workload)`` and yields one
+    ``(employee index, slot start, slot end)`` decision per slot in time order,
+    recording each through ``workload.assign`` before yielding it and raising
+    :class:`SchedulingError` for a slot nobody can cover.
+    """
+    _ENGINES[name] = engine
+
+
+def get_engine(name: str) -> SlotEngine:
+    if name not in _ENGINES and name in _LAZY_ENGINES:
+        importlib.import_module(_LAZY_ENGINES[name])
+    try:
+        return _ENGINES[name]
+    except KeyError:
+        known = ", ".join(sorted({*_ENGINES, *_LAZY_ENGINES}))
+        raise ValueError(f"Unknown scheduling engine {name!r}; expected one of {known}") from None
+
+
+@dataclass
+class _Workload:
+    """Per-employee scheduling state, indexed like the ``employees`` input."""
+
+    active: list[bool]
+    busy: list[IntervalSet]
+    existing_seconds: list[float]
+    capacity_seconds: list[float]
+    assigned_seconds: list[float]
+
+    @classmethod
+    def build(cls, employees: Sequence[Employee]) -> _Workload:
+        existing_seconds = [_booked_seconds(emp) for emp in employees]
+        return cls(
+            active=[emp.active for emp in employees],
+            busy=[_build_busy_intervals(emp) for emp in employees],
+            existing_seconds=existing_seconds,
+            capacity_seconds=[
+                max(0.0, float(emp.maxHours) * 3600.0 - existing)
+                for emp, existing in zip(employees, existing_seconds, strict=True)
+            ],
+            assigned_seconds=[0.0] * len(employees),
+        )
+
+    def remaining(self, idx: int) -> float:
+        return self.capacity_seconds[idx] - self.assigned_seconds[idx]
+
+    def key(self, idx: int) -> tuple[float, float, int]:
+        assigned = self.assigned_seconds[idx]
+        return (self.existing_seconds[idx] + assigned, assigned, idx)
+
+    def queue(self) -> CandidateQueue:
+        return CandidateQueue(
+            (self.key(idx), idx) for idx, active in enumerate(self.active) if active
+        )
 
+    def assign(self, idx: int, start: datetime, end: datetime) -> Decision:
+        self.assigned_seconds[idx] += _duration_seconds(start, end)
+        return (idx, start, end)
+
+
+def _assign_slots(
+    start: datetime,
+    end: datetime,
+    slot_duration: timedelta,
+    workload: _Workload,
+) -> Iterator[Decision]:
+    queue = workload.queue()
+    # Capacity only shrinks, so anyone unable to fit even the shortest slot of
+    # the horizon (the trailing remainder, if any) can leave the queue for good.
+    remainder = (end - start) % slot_duration
+    min_slot_seconds = (remainder or slot_duration).total_seconds()
+
+    current_start = start
     while current_start < end:
         current_end = min(current_start + slot_duration, end)
         slot_seconds = _duration_seconds(current_start, current_end)
 
-        candidates: list[int] = []
-        for idx, emp in enumerate(employees):
-            if not emp.active:
-                continue
-            if capacity_seconds[idx] - assigned_seconds[idx] < slot_seconds - 1e-9:
-                continue
-            if _has_conflict(busy_by_employee[idx], current_start, current_end):
-                continue
-            if _has_conflict(assignments[idx], current_start, current_end):
-                continue
-            candidates.append(idx)
-
-        if not candidates:
-            raise SchedulingError(
-                "Unable to find an available employee for interval "
-                f"{current_start.isoformat()} -> {current_end.isoformat()}"
-            )
+        def exhausted(idx: int) -> bool:
+            return workload.remaining(idx) < min_slot_seconds - 1e-9
 
-        chosen_idx = min(
-            candidates,
-            key=lambda i: (existing_seconds[i] + assigned_seconds[i], assigned_seconds[i], order[i]),
-        )
-        assignments[chosen_idx].append((current_start, current_end))
-        assigned_seconds[chosen_idx] += slot_seconds
+        def eligible(idx: int) -> bool:
+            if workload.remaining(idx) < slot_seconds - 1e-9:
+                return False
+            # Slots never overlap each other, so only stored busy time can clash.
+            return not workload.busy[idx].overlaps(current_start, current_end)
+
+        chosen_idx = queue.select(eligible, exhausted=exhausted)
+        if chosen_idx is None:
+            raise _unassignable(current_start, current_end)
+
+        decision = workload.assign(chosen_idx, current_start, current_end)
+        queue.push(chosen_idx, workload.key(chosen_idx))
+        yield decision
         current_start = current_end
 
-    schedules: list[Schedule] = []
-    for idx, emp_assignments in enumerate(assignments):
-        if not emp_assignments:
-            continue
-        merged = _merge_intervals(emp_assignments)
-        emp_id = employees[idx].id
-        for start_time, end_time in merged:
-            schedules.append(
-                Schedule(
-                    id=None,
-                    employeeId=emp_id,
-                    startUTC=start_time,
-                    endUTC=end_time,
-                )
+
+register_engine("python", _assign_slots)
+
+
+def _slot_bounds(start: datetime, end: datetime, slot_duration: timedelta) -> list[tuple[datetime, datetime]]:
+    slots: list[tuple[datetime, datetime]] = []
+    current_start = start
+    while current_start < end:
+        current_end = min(current_start + slot_duration, end)
+        slots.append((current_start, current_end))
+        current_start = current_end
+    return slots
+
+
+def _assign_runs(start: datetime, end: datetime, workload: _Workload) -> Iterator[Decision]:
+    queue = workload.queue()
+    breakpoints = _breakpoints(start, end, workload)
+
+    def exhausted(idx: int) -> bool:
+        return workload.remaining(idx) < 1e-6
+
+    for run_start, run_end in zip(breakpoints, breakpoints[1:]):
+        current_start = run_start
+        while current_start < run_end:
+
+            def eligible(idx: int) -> bool:
+                return not workload.busy[idx].overlaps(current_start, run_end)
+
+            chosen_idx = queue.select(eligible, exhausted=exhausted)
+            if chosen_idx is None:
+                raise _unassignable(current_start, run_end)
+
+            # Capacity boundary: the run is cut where the chosen employee's
+            # remaining hours end and the rest is handed out separately.
+            current_end = min(
+                run_end,
+                current_start + timedelta(seconds=workload.remaining(chosen_idx)),
             )
+            decision = workload.assign(chosen_idx, current_start, current_end)
+            queue.push(chosen_idx, workload.key(chosen_idx))
+            yield decision
+            current_start = current_end
 
-    schedules.sort(key=lambda s: s.startUTC)
-    return schedules
+
+def _breakpoints(start: datetime, end: datetime, workload: _Workload) -> list[datetime]:
+    points = {start, end}
+    for active, busy in zip(workload.active, workload.busy):
+        if not active:
+            continue
+        for busy_start, busy_end in busy:
+            if start < busy_start < end:
+                points.add(busy_start)
+            if start < busy_end < end:
+                points.add(busy_end)
+    return sorted(points)
+
+
+def _unassignable(start: datetime, end: datetime) -> SchedulingError:
+    return SchedulingError(
+        "Unable to find an available employee for interval "
+        f"{start.isoformat()} -> {end.isoformat()}"
+    )
 
 
 def _is_timezone_aware(dt: datetime) -> bool:
@@ -126,38 +342,19 @@ def _duration_seconds(start: datetime, end: datetime) -> float:
     return (end - start).total_seconds()
 
 
-def _build_busy_intervals(emp: Employee) -> list[tuple[datetime, datetime]]:
-    intervals: list[tuple[datetime, datetime]] = []
-    for unv in emp.unavailabilities:
-        if unv.startUTC < unv.endUTC:
-            intervals.append((unv.startUTC, unv.endUTC))
-    for sch in emp.schedules:
-        if sch.startUTC < sch.endUTC:
-            intervals.append((sch.startUTC, sch.endUTC))
-    intervals.sort(key=lambda iv: iv[0])
-    return intervals
+def _booked_seconds(emp: Employee) -> float:
+    if emp.bookedSeconds is not None:
+        return float(emp.bookedSeconds)
+    if isinstance(emp.schedules, IntervalArray):
+        return emp.schedules.total_seconds()
+    return sum(_duration_seconds(s.startUTC, s.endUTC) for s in emp.schedules)
 
 
-def _has_conflict(
-    intervals: Iterable[tuple[datetime, datetime]],
-    start: datetime,
-    end: datetime,
-) -> bool:
-    for busy_start, busy_end in intervals:
-        if busy_start < end and busy_end > start:
-            return True
-    return False
-
-
-def _merge_intervals(intervals: Iterable[tuple[datetime, datetime]]):
-    merged: list[tuple[datetime, datetime]] = []
-    for start, end in sorted(intervals, key=lambda iv: iv[0]):
-        if not merged:
-            merged.append((start, end))
-            continue
-        last_start, last_end = merged[-1]
-        if start == last_end:
-            merged[-1] = (last_start, end)
-        else:
-            merged.append((start, end))
-    return merged
+def _build_busy_intervals(emp: Employee) -> IntervalSet:
+    return IntervalSet([*_bounds(emp.unavailabilities), *_bounds(emp.schedules)])
+
+
+def _bounds(items) -> Iterable[tuple[datetime, datetime]]:
+    if isinstance(items, IntervalArray):
+        return items.bounds()
+    return ((item.startUTC.astimezone(timezone.utc), item.endUTC.astimezone(timezone.utc)) for item in items)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import heapq
+from typing import Callable, Iterable
+
+FairnessKey = tuple[float, float, int]
+
+
+class CandidateQueue:
+    """Min-heap of employee indexes ordered by the scheduler's fairness key.
+
+    The key is ``(existing + assigned seconds, assigned seconds, order)``, the
+    same tuple ``generate_schedule`` minimizes, so the first eligible entry
+    popped is exactly the employee the greedy ``min()`` over all candidates
+    would pick.  Entries skipped because they are busy for the current slot are
+    pushed back afterwards; entries reported as exhausted are dropped for good.
+    """
+
+    __slots__ = ("_heap",)
+
+    def __init__(self, entries: Iterable[tuple[FairnessKey, int]] = ()):
+        self._heap: list[tuple[FairnessKey, int]] = list(entries)
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, idx: int, key: FairnessKey) -> None:
+        heapq.heappush(self._heap, (key, idx))
+
+    def select(
+        self,
+        eligible: Callable[[int], bool],
+        *,
+        exhausted: Callable[[int], bool] | None = None,
+    ) -> int | None:
+        """Pop and return the best index accepted by ``eligible``.
+
+        The chosen index is removed from the queue; callers push it back with
+        its updated key.  Returns ``None`` when no entry is eligible.
+        """
+        skipped: list[tuple[FairnessKey, int]] = []
+        chosen: int | None = None
+        heap = self._heap
+        while heap:
+            entry = heapq.heappop(heap)
+            idx = entry[1]
+            if exhausted is not None and exhausted(idx):
+                continue
+            if eligible(idx):
+                chosen = idx
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return chosen
@@ -0,0 +1,194 @@
+"""Opt-in instrumentation for SQL statements, scheduler phases and repository calls.
+
+Off by default; every hook is a cheap no-op until :func:`enable` is called.
+Set ``EDUSCHEDULE_PROFILE=1`` (or pass ``--profile`` to the CLI) for a summary
+on stderr at exit, or ``EDUSCHEDULE_PROFILE=trace.json`` (``--profile-json``)
+to also write every recorded span as a JSON trace.
+"""
+from __future__ import annotations
+import atexit
+import functools
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TypeVar
+from eduschedule import config
+
+T = TypeVar("T")
+
+# Spans kept for the JSON trace; totals keep counting past the cap
+_TRACE_LIMIT = 100_000
+
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local()
+_origin = time.perf_counter()
+_totals: dict[str, list[float]] = {}  # name -> [calls, seconds]
+_statements: dict[str, list[float]] = {}  # SQL text -> [executions, seconds]
+_spans: list[tuple[str, float, float]] = []  # (name, offset from enable, seconds)
+_counters: dict[str, Callable[[], dict]] = {}  # name -> callable returning that component's counters
+_jsonPath: Path | None = None
+_reportRegistered = False
+
+def enabled() -> bool:
+    return _enabled
+
+def enable(jsonPath: str | Path | None = None) -> None:
+    """Start recording and report at interpreter exit (to ``jsonPath`` as well, if given)."""
+    global _enabled, _origin, _jsonPath, _reportRegistered
+    with _lock:
+        if not _enabled:
+            _origin = time.perf_counter()
+        _enabled = True
+        if jsonPath is not None:
+            _jsonPath = Path(jsonPath)
+        if not _reportRegistered:
+            atexit.register(report)
+            _reportRegistered = True
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+def reset() -> None:
+    with _lock:
+        _totals.clear()
+        _statements.clear()
+        _spans.clear()
+
+def record(name: str, start: float, seconds: float) -> None:
+    """Add one ``seconds`` long span that began at ``perf_counter()`` value ``start``."""
+    with _lock:
+        entry = _totals.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        if len(_spans) < _TRACE_LIMIT:
+            _spans.append((name, start - _origin, seconds))
+
+def record_statement(sql: str, start: float, seconds: float) -> None:
+    record(f"sql.{sql.lstrip().split(None, 1)[0].lower() if sql.strip() else 'empty'}", start, seconds)
+    with _lock:
+        entry = _statements.setdefault(sql, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+@contextmanager
+def phase(name: str):
+    """Time the enclosed block as ``name``."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, start, time.perf_counter() - start)
+
+def timed_iter(name: str, items: Iterable[T]) -> Iterator[T]:
+    """Return ``items`` with the time spent producing each element recorded as ``name``.
+
+    Lazy producers (the scheduler engines) do their work inside ``next()``, so
+    this charges that work to ``name`` however the consumer interleaves it.
+    When timed iterators are nested, each one records only its own time, not
+    the time of the iterators it pulls from.
+    """
+    if not _enabled:
+        return iter(items)
+    return _timedIter(name, iter(items))
+
+def _timedIter(name: str, it: Iterator[T]) -> Iterator[T]:
+    stack = _iterStack()
+    first = time.perf_counter()
+    total = 0.0
+    try:
+        while True:
+            stack.append(0.0)
+            t0 = time.perf_counter()
+            try:
+                item = next(it)
+            finally:
+                elapsed = time.perf_counter() - t0
+                total += elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+            yield item
+    except StopIteration:
+        return
+    finally:
+        record(name, first, total)
+
+def _iterStack() -> list[float]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def instrument(cls: type[T]) -> type[T]:
+    """Class decorator recording every public method call as ``ClassName.method``."""
+    for attr, fn in list(vars(cls).items()):
+        if attr.startswith("_") or not callable(fn):
+            continue
+        setattr(cls, attr, _wrap(f"{cls.__name__}.{attr}", fn))
+    return cls
+
+def _wrap(name: str, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record(name, start, time.perf_counter() - start)
+    return wrapper
+
+def register_stats(name: str, provider: Callable[[], dict]) -> None:
+    """Include ``provider()`` (e.g. cache hit/miss counters) in the summary under ``counters[name]``."""
+    _counters[name] = provider
+
+def summary() -> dict:
+    with _lock:
+        totals = {name: {"calls": int(c), "seconds": s} for name, (c, s) in sorted(_totals.items())}
+        statements = sorted(_statements.items(), key=lambda kv: kv[1][0], reverse=True)
+        data = {
+            "totals": totals,
+            "statements": sum(int(c) for c, _ in _statements.values()),
+            "top_statements": [{"sql": sql, "executions": int(c), "seconds": s} for sql, (c, s) in statements[:10]],
+        }
+    data["counters"] = {name: provider() for name, provider in sorted(_counters.items())}
+    return data
+
+def report(stream=None) -> None:
+    """Print the summary (and write the JSON trace, if configured)."""
+    if not _totals:
+        return
+    stream = stream or sys.stderr
+    data = summary()
+    print("-- profile --", file=stream)
+    for name, entry in data["totals"].items():
+        print(f"{name:<45} {entry['calls']:>8} calls {entry['seconds'] * 1000:>11.1f} ms", file=stream)
+    print(f"{data['statements']} SQL statements; most executed:", file=stream)
+    for entry in data["top_statements"][:5]:
+        sql = " ".join(entry["sql"].split())
+        print(f"  {entry['executions']:>6}x {sql[:100]}", file=stream)
+    for name, counters in data["counters"].items():
+        for key, values in counters.items():
+            print(f"{name}.{key}: " + ", ".join(f"{v} {k}" for k, v in values.items()), file=stream)
+    if _jsonPath is not None:
+        with _lock:
+            spans = [{"name": n, "start": o, "seconds": s} for n, o, s in _spans]
+        _jsonPath.write_text(json.dumps({**data, "spans": spans}, indent=2))
+        print(f"Trace written to {_jsonPath}", file=stream)
+
+
+def _enableFromEnv() -> None:
+    value = config.PROFILE.strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return
+    enable(None if value.lower() in ("1", "true", "yes", "on") else value)
+
+_enableFromEnv()
@@ -0,0 +1,265 @@
+"""Long-running scheduling service behind a localhost HTTP port (``eduschedule serve``).
+
+The process keeps the pooled engine and a :class:`Snapshot` of every active
+employee with their unavailabilities, schedules and compiled
+:class:`~eduschedule.domain.problem.SchedulingProblem`, so requests skip
+interpreter start-up, engine creation and the employee reload.  Writes go to
+the database first and then refresh only the employees they touched.
+
+Requests and responses are JSON; datetimes are ISO 8601 with an offset.
+
+    GET  /health          {"employees": n, "version": v, "cache": {name: {"hits", "misses", "size"}}}
+    POST /free            {"start", "end", "role"?}
+    POST /generate        {"start", "end", "role"?, "slotMinutes"?, "mode"?, "dryRun"?}
+    POST /repair          {"unavailabilityId", "slotMinutes"?, "anyRole"?}
+    POST /unavailability  {"employeeId", "start", "end", "note"?, "allowOverlap"?}
+    POST /reload          rebuild the snapshot from the database (e.g. after employees were added)
+"""
+from __future__ import annotations
+import json
+import logging
+import threading
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable
+from eduschedule.adapters.sql import cache
+from eduschedule.adapters.sql.engine import session_scope
+from eduschedule.adapters.sql.migrations import ensure_schema_current
+from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
+from eduschedule.domain.employee import Employee
+from eduschedule.domain.problem import SchedulingProblem
+from eduschedule.domain.repair import plan_repair
+from eduschedule.domain.schedule import Schedule
+from eduschedule.domain.scheduler import SchedulingError
+
+logger = logging.getLogger(__name__)
+
+class RequestError(ValueError):
+    """A request the service rejects, with the HTTP status to answer with."""
+
+    def __init__(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+class Snapshot:
+    """Active employees and their compiled scheduling state, kept in step with the database.
+
+    Compiled problems are built per role on first use and dropped for a role as soon as one of
+    its employees changes. All access goes through one lock; the scheduler is CPU-bound, so
+    serializing requests costs little.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = 0
+        self.employees: dict[int, Employee] = {}
+        self._problems: dict[str | None, SchedulingProblem] = {}
+
+    def reload(self) -> None:
+        with self.lock, session_scope() as s:
+            self.employees = {e.id: e for e in EmployeeRepo(s).listWithDetails(compact=True)}
+            self._problems.clear()
+            self.version += 1
+
+    def refresh(self, s, employeeIds: Iterable[int]) -> None:
+        """Reload the intervals of ``employeeIds`` through session ``s`` and drop the problems they belong to."""
+        unvRepo, schRepo = UnavailabilityRepo(s), ScheduleRepo(s)
+        with self.lock:
+            for empId in set(employeeIds):
+                emp = self.employees.get(empId)
+                if emp is None:
+                    continue
+                self.employees[empId] = replace(
+                    emp, unavailabilities=unvRepo.viewUnavailabilities(empId), schedules=schRepo.forEmployee(empId)
+                )
+                self._problems.pop(emp.role, None)
+                self._problems.pop(None, None)
+            self.version += 1
+
+    def members(self, role: str | None) -> list[Employee]:
+        # Same population and id order as EmployeeRepo.listForWindow, so plans match the CLI
+        return [e for e in self.employees.values() if role is None or e.role == role]
+
+    def problem(self, role: str | None) -> SchedulingProblem:
+        problem = self._problems.get(role)
+        if problem is None:
+            members = self.members(role)
+            if not members:
+                raise RequestError(f"No active employees found{f' with role {role}' if role else ''}", HTTPStatus.NOT_FOUND)
+            problem = self._problems[role] = SchedulingProblem(members)
+        return problem
+
+class SchedulingService:
+    def __init__(self, snapshot: Snapshot | None = None, *, verbose: bool = False):
+        self.snapshot = snapshot or Snapshot()
+        self.verbose = verbose
+
+    def health(self, _body: dict) -> dict:
+        return {"employees": len(self.snapshot.employees), "version": self.snapshot.version, "cache": cache.stats()}
+
+    def reload(self, _body: dict) -> dict:
+        self.snapshot.reload()
+        return self.health(_body)
+
+    def free(self, body: dict) -> dict:
+        start, end = _window(body)
+        with self.snapshot.lock:
+            problem = self.snapshot.problem(body.get("role"))
+            ids = problem.free_employees(start, end)
+            employees = self.snapshot.employees
+            return {"employees": [
+                {"id": i, "name": employees[i].name, "role": employees[i].role, "remainingHours": problem.remaining_seconds(i) / 3600}
+                for i in ids
+            ]}
+
+    def generate(self, body: dict) -> dict:
+        start, end = _window(body)
+        slot = timedelta(minutes=_int(body, "slotMinutes", 60))
+        with self.snapshot.lock:
+            problem = self.snapshot.problem(body.get("role"))
+            try:
+                plan = problem.solve(start, end, slot, mode=body.get("mode", "slots"))
+            except SchedulingError as exc:
+                raise RequestError(str(exc), HTTPStatus.UNPROCESSABLE_ENTITY) from exc
+            if not body.get("dryRun"):
+                with session_scope() as s:
+                    result = ScheduleRepo(s).bulkCreate(plan)
+                    if result.errors:
+                        s.rollback()
+                        idx, reason = result.errors[0]
+                        raise RequestError(f"Schedule for employee {plan[idx].employeeId} rejected: {reason}; nothing saved", HTTPStatus.CONFLICT)
+                    s.commit()
+                    self.snapshot.refresh(s, {sch.employeeId for sch in plan})
+            return {"saved": not body.get("dryRun"), "schedules": [_schedule(sch) for sch in plan]}
+
+    def repair(self, body: dict) -> dict:
+        unvId = _int(body, "unavailabilityId")
+        slot = timedelta(minutes=_int(body, "slotMinutes", 60))
+        with self.snapshot.lock, session_scope() as s:
+            unv = UnavailabilityRepo(s).getById(unvId)
+            if unv is None:
+                raise RequestError(f"Unavailability not found at id: {unvId}", HTTPStatus.NOT_FOUND)
+            scheduleRepo = ScheduleRepo(s)
+            affected = scheduleRepo.overlapping(unv.employeeId, unv.startUTC, unv.endUTC)
+            if not affected:
+                return {"written": 0, "reassigned": []}
+            absent = self.snapshot.employees.get(unv.employeeId) or EmployeeRepo(s).getById(unv.employeeId)
+            candidates = self.snapshot.members(None if body.get("anyRole") else absent.role)
+            try:
+                plan = plan_repair(unv, affected, candidates, slot_duration=slot)
+            except (SchedulingError, ValueError) as exc:
+                raise RequestError(f"Unable to repair schedule: {exc}", HTTPStatus.UNPROCESSABLE_ENTITY) from exc
+            written = scheduleRepo.applyRepair(plan)
+            s.commit()
+            self.snapshot.refresh(s, {unv.employeeId, *(sch.employeeId for sch in plan.reassigned)})
+            return {"written": written, "reassigned": [_schedule(sch) for sch in plan.reassigned]}
+
+    def addUnavailability(self, body: dict) -> dict:
+        empId = _int(body, "employeeId")
+        start, end = _window(body)
+        with self.snapshot.lock, session_scope() as s:
+            if EmployeeRepo(s).getById(empId) is None:
+                raise RequestError(f"Employee not found at employee ID: {empId}", HTTPStatus.NOT_FOUND)
+            unv = UnavailabilityRepo(s).create(
+                employeeId=empId, startTime=start, endTime=end, note=body.get("note"), checkOverlap=not body.get("allowOverlap")
+            )
+            s.commit()
+            self.snapshot.refresh(s, [empId])
+            return {"id": unv.id, "employeeId": empId, "start": unv.startUTC.isoformat(), "end": unv.endUTC.isoformat()}
+
+    def routes(self) -> dict[tuple[str, str], Callable[[dict], dict]]:
+        return {
+            ("GET", "/health"): self.health,
+            ("POST", "/reload"): self.reload,
+            ("POST", "/free"): self.free,
+            ("POST", "/generate"): self.generate,
+            ("POST", "/repair"): self.repair,
+            ("POST", "/unavailability"): self.addUnavailability,
+        }
+
+def _window(body: dict) -> tuple[datetime, datetime]:
+    start, end = _datetime(body, "start"), _datetime(body, "end")
+    if end <= start:
+        raise RequestError("End time must be after start time")
+    return start, end
+
+def _datetime(body: dict, key: str) -> datetime:
+    try:
+        dt = datetime.fromisoformat(body[key])
+    except KeyError:
+        raise RequestError(f"Missing field {key!r}") from None
+    except (TypeError, ValueError):
+        raise RequestError(f"Field {key!r} must be an ISO 8601 datetime") from None
+    if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
+        raise RequestError(f"Field {key!r} must include a UTC offset")
+    # Stored columns keep the wall-clock value and drop the offset, so everything is kept in UTC
+    return dt.astimezone(timezone.utc)
+
+def _int(body: dict, key: str, default: int | None = None) -> int:
+    value = body.get(key, default)
+    if value is None:
+        raise RequestError(f"Missing field {key!r}")
+    if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+        raise RequestError(f"Field {key!r} must be a positive integer")
+    return value
+
+def _schedule(sch: Schedule) -> dict:
+    return {"employeeId": sch.employeeId, "start": sch.startUTC.isoformat(), "end": sch.endUTC.isoformat()}
+
+def makeHandler(service: SchedulingService) -> type[BaseHTTPRequestHandler]:
+    routes = service.routes()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def _dispatch(self, method: str):
+            route = routes.get((method, self.path.split("?", 1)[0]))
+            if route is None:
+                return self._reply(HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {self.path}"})
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(body, dict):
+                    raise RequestError("Request body must be a JSON object")
+                self._reply(HTTPStatus.OK, route(body))
+            except json.JSONDecodeError as exc:
+                self._reply(HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {exc}"})
+            except RequestError as exc:
+                self._reply(exc.status, {"error": str(exc)})
+            except ValueError as exc:
+                self._reply(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+            except Exception as exc:
+                # e.g. a locked database: answer instead of dropping the connection
+                logger.exception("Unhandled error for %s %s", method, self.path)
+                self._reply(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Internal server error: {exc.__class__.__name__}"})
+
+        def _reply(self, status: HTTPStatus, payload: dict):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):  # keep request logs off stderr unless asked for
+            if service.verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+def makeServer(host: str = "127.0.0.1", port: int = 8765, *, verbose: bool = False) -> ThreadingHTTPServer:
+    """Check the schema, load the snapshot and bind the server (``port=0`` picks a free port)."""
+    ensure_schema_current()
+    service = SchedulingService(verbose=verbose)
+    service.snapshot.reload()
+    return ThreadingHTTPServer((host, port), makeHandler(service))
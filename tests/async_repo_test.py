@@ -0,0 +1,34 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from eduschedule.adapters.sql.async_engine import async_session_scope, dispose_async_engines
+from eduschedule.adapters.sql.repositories.aio import AsyncEmployeeRepo, AsyncScheduleRepo, AsyncUnavailabilityRepo
+
+
+def testAsyncReposRoundTrip(cliEnv):
+    start = datetime(2022, 5, 2, 9, 0, tzinfo=timezone.utc)
+
+    async def scenario():
+        try:
+            async with async_session_scope() as s:
+                emp = await AsyncEmployeeRepo(s).create(name="Async", email="async@example.com", roleName="aio")
+                await AsyncUnavailabilityRepo(s).create(employeeId=emp.id, startTime=start, endTime=start + timedelta(hours=1))
+                await AsyncScheduleRepo(s).create(employeeId=emp.id, startTime=start + timedelta(hours=2), endTime=start + timedelta(hours=3))
+
+            async def lookup():
+                async with async_session_scope() as s:
+                    return await AsyncEmployeeRepo(s).getByEmail("async@example.com")
+
+            found = await asyncio.gather(*(lookup() for _ in range(5)))
+            async with async_session_scope() as s:
+                window = await AsyncEmployeeRepo(s).listForWindow(start, start + timedelta(hours=4), role="aio")
+                clash = await AsyncScheduleRepo(s).conflicts(emp.id, start + timedelta(hours=2, minutes=30), start + timedelta(hours=4))
+            return emp, found, window, clash
+        finally:
+            await dispose_async_engines()
+
+    emp, found, window, clash = asyncio.run(scenario())
+    assert all(e.id == emp.id and e.role == "aio" for e in found)
+    assert [e.id for e in window] == [emp.id]
+    assert len(window[0].unavailabilities) == 1 and len(window[0].schedules) == 1
+    assert clash is True
@@ -0,0 +1,98 @@
+import sqlite3
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+from eduschedule.adapters.sql.cache import VersionedCache, bump, cache, clearAll
+from eduschedule.adapters.sql.models.employee import Employee as ormEmployee
+from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+
+def testRepeatedLookupsHitTheCache(session):
+    clearAll()
+    repo = EmployeeRepo(session)
+    emp = repo.create(name='Cached', email='cached@example.com', roleName='tutor')
+    stats = cache("employees")
+    assert repo.getById(emp.id) == repo.getById(emp.id) == repo.getByEmail('cached@example.com')
+    assert (stats.hits, stats.misses) == (1, 2)
+    assert repo.getById(emp.id) is not repo.getById(emp.id)
+
+def testWritesFromAnySessionInvalidate(session, unitEngine):
+    repo = EmployeeRepo(session)
+    emp = repo.create(name='Before', email='rename@example.com', roleName=None)
+    assert repo.getById(emp.id).name == 'Before'
+    other = sessionmaker(unitEngine)()
+    try:
+        other.execute(update(ormEmployee).where(ormEmployee.id == emp.id).values(name='After'))
+        other.commit()
+    finally:
+        other.close()
+    session.expire_all()
+    assert repo.getById(emp.id).name == 'After'
+    assert 'rename@example.com' in {e.email for e in repo.list()}
+
+def testRollbackDropsUncommittedReads(session):
+    repo = EmployeeRepo(session)
+    emp = repo.create(name='Gone', email='gone@example.com', roleName='ghost')
+    session.execute(update(ormEmployee).where(ormEmployee.id == emp.id).values(name='Pending'))
+    assert repo.getById(emp.id).name == 'Pending'
+    session.rollback()
+    assert repo.getById(emp.id).name == 'Gone'
+
+def testRoleLookupReusesCachedId(session):
+    repo = EmployeeRepo(session)
+    repo.create(name='R1', email='r1@example.com', roleName='reviewer')  # inserts the role
+    repo.create(name='R2', email='r2@example.com', roleName='reviewer')  # caches its id
+    hits = cache("roles").hits
+    third = repo.create(name='R3', email='r3@example.com', roleName='reviewer')
+    assert third.role == 'reviewer'
+    assert cache("roles").hits == hits + 1
+
+def testEntriesExpireAndEvict(monkeypatch):
+    c = VersionedCache("test", maxsize=2, ttl=10)
+    now = [0.0]
+    monkeypatch.setattr("eduschedule.adapters.sql.cache.time.monotonic", lambda: now[0])
+    loads = []
+    def load(key):
+        return lambda: loads.append(key) or key
+    for key in ("a", "b", "a", "c", "b"):
+        c.getOrLoad(key, ("t",), load(key))
+    assert loads == ["a", "b", "c", "b"]  # "b" was the least recently used when "c" arrived
+    now[0] = 11
+    c.getOrLoad("a", ("t",), load("a"))
+    bump(["t"])
+    c.getOrLoad("a", ("t",), load("a"))
+    assert loads[-2:] == ["a", "a"]
+    assert c.stats() == {"hits": 1, "misses": 6, "size": 2}
+
+def testUncommittedWritesStayOutOfTheSharedCache(session, unitEngine):
+    repo = EmployeeRepo(session)
+    result = repo.bulkCreate([{"name": "Dirty", "email": "dirty@example.com", "roleName": None}])
+    assert result.created == 1
+    assert repo.getByEmail("dirty@example.com").name == "Dirty"  # the writer sees its own row
+    other = sessionmaker(unitEngine)()
+    try:
+        assert EmployeeRepo(other).getByEmail("dirty@example.com") is None
+    finally:
+        other.close()
+    session.rollback()
+    assert repo.getByEmail("dirty@example.com") is None
+
+def testRoleNamedStarIsAnOrdinaryRole(session):
+    repo = EmployeeRepo(session)
+    repo.create(name='S1', email='star1@example.com', roleName='*')
+    repo.bulkCreate([{"name": "S2", "email": "star2@example.com", "roleName": "*"}])
+    session.commit()
+    assert repo.create(name='S3', email='star3@example.com', roleName='*').role == '*'
+    assert repo.getByEmail('star2@example.com').role == '*'
+
+def testBulkCreateSeesRolesFromOtherProcesses(session, unitEngine):
+    repo = EmployeeRepo(session)
+    repo.bulkCreate([{"name": "E1", "email": "ext1@example.com", "roleName": None}])
+    session.commit()
+    # A raw connection stands in for another process: its writes bump no cache versions
+    def rows():
+        yield {"name": "E2", "email": "ext2@example.com", "roleName": "external"}
+        with sqlite3.connect(unitEngine.url.database) as raw:
+            raw.execute("INSERT INTO roles (name) VALUES ('late')")
+        yield {"name": "E3", "email": "ext3@example.com", "roleName": "late"}
+    result = repo.bulkCreate(rows(), batchSize=1, commitBatches=True)
+    assert (result.created, result.errors) == (2, [])
+    assert repo.getByEmail("ext3@example.com").role == "late"
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Cumulative import time allowed for eduschedule's own CLI modules, excluding Typer itself
+IMPORT_BUDGET_US = 150_000
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+def testCliImportSkipsDatabaseLayer():
+    res = _python("-c", "import sys, eduschedule.cli.main; print(sorted(m for m in ('sqlalchemy', 'eduschedule.adapters.sql.engine') if m in sys.modules))")
+    assert res.stdout.strip() == "[]"
+
+
+def testCliImportTimeBudget():
+    # Import typer first so its (unavoidable) cost is not charged to the CLI module
+    res = _python("-X", "importtime", "-c", "import typer; import eduschedule.cli.main")
+    cumulative = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cum.isdigit():
+            cumulative[name] = int(cum)
+    assert cumulative["eduschedule.cli.main"] < IMPORT_BUDGET_US, cumulative["eduschedule.cli.main"]
+
+
+def testDiagnosticReportsColdStart(monkeypatch):
+    from typer.testing import CliRunner
+    from eduschedule.cli.main import app
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")])))
+    res = CliRunner().invoke(app, ["diagnostic"])
+    assert res.exit_code == 0, res.output
+    assert "Cold start:" in res.output
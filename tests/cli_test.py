@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 from typer.testing import CliRunner
 from datetime import datetime, timezone, timedelta
 from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
@@ -38,4 +41,52 @@ def testlistUnavailabilitiesBetween(cliEnv):
 
     assert result.exit_code == 0, result.output
     assert "2020-01-01 09:00 -> 2020-01-01 10:00" in result.output
-    assert "15:00" not in result.output
\ No newline at end of file
+    assert "15:00" not in result.output
+
+def testListEmployeesFormats(cliEnv):
+    runner = CliRunner()
+    res = runner.invoke(app, ["add-employee", "--name", "FormatFan", "--email", "formats@example.com", "--role", "tutor"], env=cliEnv)
+    assert res.exit_code == 0, res.output
+
+    res = runner.invoke(app, ["list-employees", "--format", "json"], env=cliEnv)
+    assert res.exit_code == 0, res.output
+    rows = {r["email"]: r for r in json.loads(res.output)}
+    assert rows["formats@example.com"]["role"] == "tutor"
+
+    res = runner.invoke(app, ["list-employees", "--format", "csv"], env=cliEnv)
+    assert res.exit_code == 0, res.output
+    assert "formats@example.com" in {r["email"] for r in csv.DictReader(io.StringIO(res.output))}
+
+    res = runner.invoke(app, ["list-employees", "--format", "xml"], env=cliEnv)
+    assert res.exit_code != 0
+
+def testFreeEmployees(cliEnv):
+    runner = CliRunner(mix_stderr=False)
+    res = runner.invoke(app, ["add-employee", "--name", "Idle", "--email", "idle@example.com", "--role", "on-call"], env=cliEnv)
+    assert res.exit_code == 0, res.output
+
+    args = ["free-employees", "--start", "2031-01-06 09:00", "--end", "2031-01-06 11:00", "--role", "on-call"]
+    res = runner.invoke(app, [*args, "--format", "json"], env=cliEnv)
+    assert res.exit_code == 0, res.output
+    assert [(r["email"], r["remainingHours"]) for r in json.loads(res.stdout)] == [("idle@example.com", 20)]
+
+    res = runner.invoke(app, [*args, "--min-remaining-hours", "40"], env=cliEnv)
+    assert res.exit_code == 0, res.output
+    assert "No free employees found" in res.output
+
+def testCoverageGaps(cliEnv):
+    runner = CliRunner(mix_stderr=False)
+    res = runner.invoke(app, ["add-employee", "--name", "Cover", "--email", "cover@example.com", "--role", "coverage"], env=cliEnv)
+    assert res.exit_code == 0, res.output
+
+    args = ["coverage-gaps", "--start", "2032-03-01 08:00", "--end", "2032-03-01 12:00", "-z", "UTC"]
+    res = runner.invoke(app, [*args, "--role", "coverage", "--format", "json"], env=cliEnv)
+    assert res.exit_code == 0, res.output
+    assert json.loads(res.stdout) == [{"role": "coverage", "start": "2032-03-01 08:00", "end": "2032-03-01 12:00", "staffed": 0, "status": "uncovered"}]
+
+    res = runner.invoke(app, [*args, "--by-role"], env=cliEnv)
+    assert res.exit_code == 0, res.output
+    assert "coverage: 2032-03-01 08:00 -> 2032-03-01 12:00\tuncovered (0 scheduled)" in res.stdout
+
+    res = runner.invoke(app, [*args, "--by-role", "--role", "coverage"], env=cliEnv)
+    assert res.exit_code != 0
@@ -0,0 +1,55 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from eduschedule.domain.coverage import CoverageSegment, coverage_gaps, coverage_gaps_by
+
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _h(hours: float) -> datetime:
+    return BASE + timedelta(hours=hours)
+
+
+def test_coverage_gaps_reports_uncovered_and_overlapping_parts():
+    shifts = [(_h(-2), _h(1)), (_h(2), _h(5)), (_h(3), _h(4)), (_h(4), _h(6)), (_h(9), _h(12))]
+    assert list(coverage_gaps(shifts, _h(0), _h(10))) == [
+        CoverageSegment(_h(1), _h(2), 0),
+        CoverageSegment(_h(3), _h(5), 2),
+        CoverageSegment(_h(6), _h(9), 0),
+    ]
+    assert list(coverage_gaps([], _h(0), _h(1))) == [CoverageSegment(_h(0), _h(1), 0)]
+    assert [(seg.start, seg.staffed) for seg in coverage_gaps(shifts, _h(0), _h(10), required=2)][:3] == [
+        (_h(0), 1), (_h(1), 0), (_h(2), 1)
+    ]
+
+
+def test_coverage_gaps_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(50):
+        starts = sorted(rng.randrange(-10, 100) for _ in range(rng.randrange(0, 30)))
+        intervals = [(s, s + rng.randrange(1, 15)) for s in starts]
+        required = rng.choice((1, 2))
+        staffed = [sum(s <= t < e for s, e in intervals) for t in range(100)]
+        expected = [t for t in range(100) if staffed[t] != required]
+        segments = list(coverage_gaps(intervals, 0, 100, required=required))
+        assert [t for seg in segments for t in range(seg.start, seg.end)] == expected
+        assert all(staffed[t] == seg.staffed for seg in segments for t in range(seg.start, seg.end))
+        # Maximal: neighbouring reported segments never share a staffing level
+        assert all(a.end < b.start or a.staffed != b.staffed for a, b in zip(segments, segments[1:]))
+
+
+def test_coverage_gaps_by_key_and_validation():
+    rows = [("desk", 0, 4), ("lab", 1, 3), ("desk", 2, 6)]
+    gaps = coverage_gaps_by(rows, 0, 8, keys=["desk", "lab", "gym"])
+    assert gaps == {
+        "desk": [CoverageSegment(2, 4, 2), CoverageSegment(6, 8, 0)],
+        "lab": [CoverageSegment(0, 1, 0), CoverageSegment(3, 8, 0)],
+        "gym": [CoverageSegment(0, 8, 0)],
+    }
+    with pytest.raises(ValueError):
+        list(coverage_gaps([(3, 4), (1, 2)], 0, 8))
+    with pytest.raises(ValueError):
+        list(coverage_gaps([], 5, 5))
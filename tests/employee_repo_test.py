@@ -59,4 +59,139 @@ def testListWithUnavailabilities(session):
 
     assert len(by_id[emp1.id].unavailabilities) == 1
     assert by_id[emp1.id].unavailabilities[0].employeeId == emp1.id
-    assert len(by_id[emp2.id].unavailabilities) == 1
\ No newline at end of file
+    assert len(by_id[emp2.id].unavailabilities) == 1
+
+def testBulkCreate(session):
+    repo = EmployeeRepo(session)
+    repo.create(name='Existing', email='bulk-existing@example.com', roleName='bulk-r1')
+    session.commit()
+    rows = [
+        {"name": "B1", "email": "bulk1@example.com", "roleName": "bulk-r1", "maxHours": 10},
+        {"name": "B2", "email": "bulk2@example.com", "roleName": " bulk-r2 "},
+        {"name": "", "email": "bulk3@example.com", "roleName": None},
+        {"name": "B4", "email": "bulk1@example.com", "roleName": None},
+        {"name": "B5", "email": "bulk-existing@example.com", "roleName": None},
+        {"name": "B6", "email": "bulk6@example.com", "roleName": "bulk-r2"},
+    ]
+
+    result = repo.bulkCreate(rows, batchSize=2)
+    session.commit()
+
+    assert result.created == 3
+    assert [idx for idx, _ in result.errors] == [2, 3, 4]
+    b1 = repo.getByEmail("bulk1@example.com")
+    assert (b1.role, b1.maxHours) == ("bulk-r1", 10)
+    assert repo.getByEmail("bulk2@example.com").role == "bulk-r2"
+    assert repo.getByEmail("bulk6@example.com").role == "bulk-r2"
+
+def testListForWindow(session):
+    from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+
+    eRepo = EmployeeRepo(session)
+    emp = eRepo.create(name="W", email="window@example.com", roleName="window")
+    session.commit()
+    sRepo = ScheduleRepo(session)
+    uRepo = UnavailabilityRepo(session)
+    day = datetime(2021, 3, 1, tzinfo=timezone.utc)
+    sRepo.create(employeeId=emp.id, startTime=day - timedelta(days=30), endTime=day - timedelta(days=30) + timedelta(hours=3))
+    sRepo.create(employeeId=emp.id, startTime=day + timedelta(hours=8), endTime=day + timedelta(hours=9, minutes=30))
+    uRepo.create(employeeId=emp.id, startTime=day - timedelta(hours=1), endTime=day + timedelta(hours=1))
+    uRepo.create(employeeId=emp.id, startTime=day + timedelta(days=3), endTime=day + timedelta(days=3, hours=1))
+    session.commit()
+
+    loaded = {e.id: e for e in eRepo.listForWindow(day, day + timedelta(days=1))}[emp.id]
+
+    assert [(s.startUTC, s.endUTC) for s in loaded.schedules] == [(day + timedelta(hours=8), day + timedelta(hours=9, minutes=30))]
+    assert [(u.startUTC, u.endUTC) for u in loaded.unavailabilities] == [(day - timedelta(hours=1), day + timedelta(hours=1))]
+    assert loaded.bookedSeconds == 4.5 * 3600
+    assert loaded.role == "window"
+    assert set(eRepo.bookedSeconds([emp.id])) == {emp.id}
+
+def testFreeBetweenMatchesScheduler(session):
+    from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+    from eduschedule.domain.problem import SchedulingProblem
+
+    eRepo = EmployeeRepo(session)
+    busy, away, full, free = (
+        eRepo.create(name=n, email=f"{n}@free.example.com", roleName="free-check", maxHours=h)
+        for n, h in (("busy", 20), ("away", 20), ("full", 3), ("free", 20))
+    )
+    sRepo, uRepo = ScheduleRepo(session), UnavailabilityRepo(session)
+    day = datetime(2021, 6, 1, 9, tzinfo=timezone.utc)
+    sRepo.create(employeeId=busy.id, startTime=day + timedelta(minutes=30), endTime=day + timedelta(hours=1))
+    uRepo.create(employeeId=away.id, startTime=day - timedelta(hours=1), endTime=day + timedelta(minutes=1))
+    sRepo.create(employeeId=full.id, startTime=day - timedelta(days=1), endTime=day - timedelta(days=1) + timedelta(hours=2))
+    sRepo.create(employeeId=free.id, startTime=day + timedelta(hours=2), endTime=day + timedelta(hours=3))
+    session.commit()
+    start, end = day, day + timedelta(hours=2)
+
+    found = eRepo.freeBetween(start, end, role="free-check")
+    assert [e.id for e in found] == [free.id]
+    assert found[0].bookedSeconds == 3600
+    problem = SchedulingProblem(eRepo.listForWindow(start, end, role="free-check"))
+    assert [e.id for e in found] == problem.free_employees(start, end)
+
+    assert [e.id for e in eRepo.freeBetween(start, end, role="free-check", min_remaining_hours=1)] == [full.id, free.id]
+    assert eRepo.freeBetween(start, end, role="free-check", min_remaining_hours=20) == []
+    assert eRepo.freeBetween(start, end, role="no-such-role") == []
+
+def testListCompactMatchesFull(session):
+    from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+    from eduschedule.domain.intervals import IntervalArray
+
+    eRepo = EmployeeRepo(session)
+    emp = eRepo.create(name="K", email="compact@example.com", roleName="compact")
+    session.commit()
+    day = datetime(2021, 4, 1, tzinfo=timezone.utc)
+    ScheduleRepo(session).create(employeeId=emp.id, startTime=day + timedelta(hours=8), endTime=day + timedelta(hours=10))
+    UnavailabilityRepo(session).create(employeeId=emp.id, startTime=day, endTime=day + timedelta(hours=2), note="dentist")
+    session.commit()
+
+    full = {e.id: e for e in eRepo.listWithDetails()}[emp.id]
+    compact = {e.id: e for e in eRepo.listWithDetails(compact=True)}[emp.id]
+
+    assert isinstance(compact.schedules, IntervalArray)
+    assert list(compact.schedules) == list(full.schedules)
+    assert list(compact.unavailabilities) == list(full.unavailabilities)
+    assert compact.role == "compact"
+
+    windowed = {e.id: e for e in eRepo.listForWindow(day, day + timedelta(hours=9), compact=True)}[emp.id]
+    assert windowed.bookedSeconds == 2 * 3600
+    assert [(u.startUTC, u.note) for u in windowed.unavailabilities] == [(day, "dentist")]
+
+def testIterStreamsWithRoleAndKeyset(session):
+    eRepo = EmployeeRepo(session)
+    first = eRepo.create(name="I1", email="iter1@example.com", roleName="iterRole")
+    second = eRepo.create(name="I2", email="iter2@example.com", roleName=None)
+    session.commit()
+
+    streamed = {e.id: e for e in eRepo.iter(batchSize=1)}
+    assert streamed[first.id].role == "iterRole"
+    assert streamed[second.id].role is None
+    assert [e.id for e in eRepo.iter(afterId=first.id)] == [e.id for e in eRepo.list() if e.id > first.id]
+
+def testIterPagesDoNotBlockWriters(session, unitEngine):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    eRepo = EmployeeRepo(session)
+    for i in range(3):
+        eRepo.create(name=f"P{i}", email=f"page{i}@example.com", roleName="pager")
+    stream = eRepo.iter(batchSize=1)
+    next(stream)
+
+    # A writer that would block on an open read fails fast instead of waiting
+    writer = create_engine(unitEngine.url, connect_args={"timeout": 0.1})
+    other = sessionmaker(writer)()
+    try:
+        late = EmployeeRepo(other).create(name="Late", email="page-late@example.com", roleName="pager")
+    finally:
+        other.close()
+        writer.dispose()
+    assert late.id in {e.id for e in stream}
+
+    unvRepo = UnavailabilityRepo(session)
+    at = datetime(2034, 1, 2, 9, tzinfo=timezone.utc)
+    ids = [unvRepo.create(employeeId=late.id, startTime=at, endTime=at + timedelta(hours=1), checkOverlap=False).id for _ in range(3)]
+    session.commit()
+    assert [u.id for u in unvRepo.iter(late.id, batchSize=2)] == ids
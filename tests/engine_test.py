@@ -0,0 +1,51 @@
+from sqlalchemy import text
+
+from eduschedule.adapters.sql import engine as engineModule
+from eduschedule.adapters.sql.engine import dispose_engines, get_engine, session_scope
+
+
+def testEngineIsReusedAcrossScopes(cliEnv):
+    with session_scope() as s:
+        first = s.get_bind()
+        assert s.scalar(text("SELECT 1")) == 1
+    with session_scope() as s:
+        assert s.get_bind() is first
+    assert get_engine() is first
+
+
+def testEnginePerUrl(cliEnv, tmp_path, monkeypatch):
+    original = get_engine()
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'other.db'}")
+    other = get_engine()
+    assert other is not original
+    assert str(other.url).endswith("other.db")
+
+
+def testDisposeEnginesClearsCache(cliEnv, monkeypatch):
+    monkeypatch.setattr(engineModule.config, "DB_POOL_SIZE", 2)
+    dispose_engines()
+    eng = get_engine()
+    assert eng.pool.size() == 2
+    dispose_engines()
+    assert get_engine() is not eng
+
+
+def testSqliteProfileAppliedOnConnect(cliEnv, tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'tuned.db'}")
+    plain = get_engine()
+    monkeypatch.setattr(engineModule.config, "SQLITE_PROFILE", "throughput")
+    monkeypatch.setattr(engineModule.config, "SQLITE_PRAGMAS", {"synchronous": "FULL"})
+    tuned = get_engine()
+    assert tuned is not plain
+    with tuned.connect() as conn:
+        assert conn.scalar(text("PRAGMA journal_mode")) == "wal"
+        assert conn.scalar(text("PRAGMA synchronous")) == 2  # FULL, overriding the profile's NORMAL
+        assert conn.scalar(text("PRAGMA temp_store")) == 2  # MEMORY
+        assert conn.scalar(text("PRAGMA foreign_keys")) == 1
+
+
+def testUnknownSqliteProfile(monkeypatch):
+    import pytest
+    monkeypatch.setattr(engineModule.config, "SQLITE_PROFILE", "turbo")
+    with pytest.raises(ValueError):
+        engineModule.sqlite_pragmas()
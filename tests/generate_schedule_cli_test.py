@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from typer.testing import CliRunner
+
+from eduschedule.adapters.sql.engine import session_scope
+from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
+from eduschedule.cli.main import app
+
+
+def _seed(role: str) -> tuple[int, int]:
+    with session_scope() as s:
+        repo = EmployeeRepo(s)
+        first = repo.create(name="Gen One", email=f"gen1_{role}@example.com", roleName=role, maxHours=10)
+        second = repo.create(name="Gen Two", email=f"gen2_{role}@example.com", roleName=role, maxHours=10)
+        start = datetime(2026, 1, 5, 8, 0, tzinfo=timezone.utc)
+        UnavailabilityRepo(s).create(employeeId=first.id, startTime=start, endTime=start + timedelta(hours=1))
+        return first.id, second.id
+
+
+def testGenerateScheduleDryRunAndPersist(cliEnv):
+    role = f"gen-{uuid4().hex[:8]}"
+    first, second = _seed(role)
+    runner = CliRunner()
+    args = ["generate-schedule", "--start", "2026-01-05 08:00", "--end", "2026-01-05 11:00", "-z", "UTC", "--role", role]
+
+    result = runner.invoke(app, [*args, "--dry-run"], env=cliEnv)
+    assert result.exit_code == 0, result.output
+    assert f"{second}\t2026-01-05 08:00 -> 2026-01-05 09:00" in result.output
+    assert f"{first}\t2026-01-05 09:00 -> 2026-01-05 11:00" in result.output
+    assert "load:" in result.output and "persist:" in result.output
+    with session_scope() as s:
+        assert ScheduleRepo(s).forEmployee(second) == []
+
+    result = runner.invoke(app, args, env=cliEnv)
+    assert result.exit_code == 0, result.output
+    assert "Saved 2 schedules for 2 employees" in result.output
+    with session_scope() as s:
+        repo = ScheduleRepo(s)
+        assert len(repo.forEmployee(first)) == 1
+        assert len(repo.forEmployee(second)) == 1
+
+    # Everyone is now busy for that window
+    result = runner.invoke(app, args, env=cliEnv)
+    assert result.exit_code != 0
+
+
+def testGenerateScheduleUnknownRole(cliEnv):
+    result = CliRunner().invoke(
+        app,
+        ["generate-schedule", "--start", "2026-01-05 08:00", "--end", "2026-01-05 11:00", "--role", f"none-{uuid4().hex}"],
+        env=cliEnv,
+    )
+    assert result.exit_code != 0
+    assert "No active employees" in result.output
@@ -9,4 +9,19 @@ def testEmployeeImport(cliEnv, tmp_path):
         "Bob,bob@example.com,assistant,25\n")
     runner = CliRunner()
     result = runner.invoke(app, ["import-employees", str(file)], env=cliEnv)
-    assert result.exit_code == 0, result.output
\ No newline at end of file
+    assert result.exit_code == 0, result.output
+
+def testEmployeeImportReportsBadRows(cliEnv, tmp_path):
+    from eduschedule.cli.main import app
+    file = tmp_path / "emps.csv"
+    file.write_text("name,email,role,max_hours\n"
+        "Cara,cara@example.com,teacher,30\n"
+        ",nobody@example.com,teacher,30\n"
+        "Cara Again,cara@example.com,teacher,30\n"
+        "Dan,dan@example.com,,oops\n")
+    runner = CliRunner()
+    result = runner.invoke(app, ["import-employees", str(file), "--batch-size", "2", "--commit-batches"], env=cliEnv)
+    assert result.exit_code == 0, result.output
+    assert "Imported 2 employees" in result.output
+    assert "Skipped line 3" in result.output
+    assert "Skipped line 4" in result.output
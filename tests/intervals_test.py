@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+from eduschedule.domain.intervals import IntervalSet
+
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _h(hours: float) -> datetime:
+    return BASE + timedelta(hours=hours)
+
+
+def test_interval_set_normalizes_and_merges():
+    intervals = IntervalSet([(_h(3), _h(4)), (_h(0), _h(1)), (_h(1), _h(2)), (_h(3.5), _h(5)), (_h(6), _h(6))])
+
+    assert list(intervals) == [(_h(0), _h(2)), (_h(3), _h(5))]
+
+
+def test_interval_set_overlaps_is_half_open():
+    intervals = IntervalSet([(_h(1), _h(2)), (_h(4), _h(5))])
+
+    assert intervals.overlaps(_h(1.5), _h(1.75))
+    assert intervals.overlaps(_h(0), _h(4.5))
+    assert not intervals.overlaps(_h(2), _h(4))
+    assert not intervals.overlaps(_h(0), _h(1))
+    assert not intervals.overlaps(_h(5), _h(6))
+
+
+def test_interval_set_add_bridges_neighbours():
+    intervals = IntervalSet([(_h(0), _h(1)), (_h(2), _h(3)), (_h(5), _h(6))])
+
+    intervals.add(_h(1), _h(2))
+    intervals.add(_h(4), _h(4.5))
+
+    assert list(intervals) == [(_h(0), _h(3)), (_h(4), _h(4.5)), (_h(5), _h(6))]
+
+
+def test_interval_set_union_and_subtract():
+    left = IntervalSet([(_h(0), _h(4)), (_h(6), _h(8))])
+    right = IntervalSet([(_h(1), _h(2)), (_h(3), _h(7))])
+
+    assert list(left.union(right)) == [(_h(0), _h(8))]
+    assert list(left.subtract(right)) == [(_h(0), _h(1)), (_h(2), _h(3)), (_h(7), _h(8))]
+    assert list(right.subtract(left)) == [(_h(4), _h(6))]
+
+
+def test_interval_array_round_trips_items():
+    from eduschedule.domain.intervals import IntervalArray
+    from eduschedule.domain.unavailability import Unavailability
+
+    items = [
+        Unavailability(id=1, employeeId=7, startUTC=_h(0), endUTC=_h(2), note="exam"),
+        Unavailability(id=None, employeeId=7, startUTC=_h(5), endUTC=_h(6)),
+    ]
+    arr = IntervalArray.from_items(items)
+
+    assert len(arr) == 2
+    assert list(arr) == items
+    assert arr[-1] == items[1]
+    assert list(arr.bounds()) == [(_h(0), _h(2)), (_h(5), _h(6))]
+    assert arr.total_seconds() == 3 * 3600
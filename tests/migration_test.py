@@ -4,4 +4,20 @@ def testAlembicDbCreate(tempDbUrl):
     eng = create_engine(tempDbUrl, future=True)
     insp = inspect(eng)
     tables = set(insp.get_table_names())
-    assert {"roles", "employees"}.issubset(tables), tables
\ No newline at end of file
+    assert {"roles", "employees"}.issubset(tables), tables
+
+def testInProcessUpgradeAndSchemaCheck(tmp_path):
+    import pytest
+    from eduschedule.adapters.sql import migrations
+
+    eng = create_engine(f"sqlite:///{tmp_path / 'inproc.db'}", future=True)
+    try:
+        with pytest.raises(migrations.SchemaNotCurrentError):
+            migrations.ensure_schema_current(eng)
+
+        migrations.upgrade(engine=eng)
+        assert migrations.current_revision(eng) == migrations.head_revision()
+        migrations.ensure_schema_current(eng)
+        assert {"employees", "schedules", "unavailabilities"}.issubset(inspect(eng).get_table_names())
+    finally:
+        eng.dispose()
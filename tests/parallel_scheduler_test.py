@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+
+from eduschedule.domain.employee import Employee
+from eduschedule.domain.parallel import generate_schedule_partitioned
+from eduschedule.domain.scheduler import generate_schedule
+from eduschedule.domain.unavailability import Unavailability
+
+
+def _make_employee(emp_id: int, role: str, **kwargs) -> Employee:
+    base = dict(name=f"Employee {emp_id}", email=f"e{emp_id}@example.com", role=role, maxHours=10)
+    base.update(kwargs)
+    return Employee(id=emp_id, **base)
+
+
+def test_partitioned_schedule_matches_per_role_runs_and_isolates_errors():
+    start = datetime(2024, 10, 7, 9, 0, tzinfo=timezone.utc)
+    end = start + timedelta(hours=4)
+    teachers = [
+        _make_employee(1, "teacher", unavailabilities=[Unavailability(id=1, employeeId=1, startUTC=start, endUTC=start + timedelta(hours=1))]),
+        _make_employee(2, "teacher"),
+    ]
+    aides = [_make_employee(3, "aide"), _make_employee(4, "aide", maxHours=1)]
+    tutors = [_make_employee(5, "tutor", maxHours=1)]
+
+    result = generate_schedule_partitioned(start, end, [*teachers, *tutors, *aides], max_workers=2)
+
+    assert list(result.partitions) == ["aide", "teacher"]
+    assert list(result.errors) == ["tutor"]
+    assert result.partitions["teacher"] == generate_schedule(start, end, teachers)
+    assert result.partitions["aide"] == generate_schedule(start, end, aides)
+    assert [(s.startUTC, s.employeeId) for s in result.schedules] == sorted(
+        (s.startUTC, s.employeeId) for s in [*result.partitions["teacher"], *result.partitions["aide"]]
+    )
+
+
+def test_partitioned_schedule_custom_key_runs_inline():
+    start = datetime(2024, 10, 8, 9, 0, tzinfo=timezone.utc)
+    end = start + timedelta(hours=2)
+    employees = [_make_employee(1, "a"), _make_employee(2, "b")]
+
+    result = generate_schedule_partitioned(start, end, employees, key=lambda emp: "site-1", max_workers=1)
+
+    assert list(result.partitions) == ["site-1"]
+    assert result.schedules == generate_schedule(start, end, employees)
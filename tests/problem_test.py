@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from eduschedule.domain.employee import Employee
+from eduschedule.domain.problem import Scenario, SchedulingProblem
+from eduschedule.domain.schedule import Schedule
+from eduschedule.domain.scheduler import SchedulingError, generate_schedule
+from eduschedule.domain.unavailability import Unavailability
+
+
+START = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def _employees() -> list[Employee]:
+    return [
+        Employee(
+            id=1, name="A", email="a@example.com", role="staff", maxHours=6,
+            unavailabilities=[Unavailability(id=None, employeeId=1, startUTC=START + timedelta(hours=1), endUTC=START + timedelta(hours=3))],
+        ),
+        Employee(
+            id=2, name="B", email="b@example.com", role="staff", maxHours=6,
+            schedules=[Schedule(id=None, employeeId=2, startUTC=START - timedelta(days=1), endUTC=START - timedelta(days=1, hours=-2))],
+        ),
+        Employee(id=3, name="C", email="c@example.com", role="staff", maxHours=3),
+    ]
+
+
+def test_solve_matches_generate_schedule():
+    employees = _employees()
+    problem = SchedulingProblem(employees)
+
+    for end_hours, slot, mode in [(4, timedelta(hours=1), "slots"), (6, timedelta(minutes=30), "slots"), (8, timedelta(hours=1), "runs")]:
+        end = START + timedelta(hours=end_hours)
+        assert problem.solve(START, end, slot, mode=mode) == generate_schedule(START, end, employees, slot_duration=slot, mode=mode)
+
+
+def test_solve_exclude_matches_filtered_employees():
+    employees = _employees()
+    problem = SchedulingProblem(employees)
+    end = START + timedelta(hours=5)
+
+    expected = generate_schedule(START, end, [e for e in employees if e.id != 3])
+    assert problem.solve(START, end, exclude={3}) == expected
+    # Excluding one scenario's employee does not leak into the next solve.
+    assert problem.solve(START, end) == generate_schedule(START, end, employees)
+
+    with pytest.raises(ValueError):
+        problem.solve(START, end, exclude={99})
+
+
+def test_solve_many_reports_failures_per_scenario():
+    problem = SchedulingProblem(_employees())
+    results = problem.solve_many([
+        Scenario(START, START + timedelta(hours=2)),
+        Scenario(START, START + timedelta(hours=4), exclude=frozenset({2, 3})),
+    ])
+
+    assert [s.employeeId for s in results[0]] == [1, 3]
+    assert isinstance(results[1], SchedulingError)
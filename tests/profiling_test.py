@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from eduschedule import profiling
+from eduschedule.adapters.sql.engine import _makeEngine
+from eduschedule.domain.employee import Employee
+from eduschedule.domain.scheduler import generate_schedule
+
+
+def testProfilingRecordsPhasesAndStatements():
+    start = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+    employees = [Employee(id=1, name="A", email="a@example.com", role="staff", maxHours=10)]
+    eng = _makeEngine("sqlite://")
+    profiling.enable()
+    try:
+        generate_schedule(start, start + timedelta(hours=3), employees)
+        with eng.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        totals = profiling.summary()["totals"]
+    finally:
+        profiling.disable()
+        profiling.reset()
+        eng.dispose()
+
+    for phase in ("scheduler.validate", "scheduler.index", "scheduler.slots_loop", "scheduler.merge"):
+        assert totals[phase]["calls"] == 1
+    assert totals["sql.select"]["calls"] >= 2
+
+
+def testProfilingIsNoOpWhenDisabled():
+    start = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+    generate_schedule(start, start + timedelta(hours=1), [Employee(id=1, name="A", email="a", role="r", maxHours=1)])
+    assert profiling.summary()["totals"] == {}
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from typer.testing import CliRunner
+
+from eduschedule.adapters.sql.engine import session_scope
+from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+from eduschedule.adapters.sql.repositories.schedules import ScheduleRepo
+from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
+from eduschedule.cli.main import app
+from eduschedule.domain.employee import Employee
+from eduschedule.domain.repair import plan_repair
+from eduschedule.domain.schedule import Schedule
+from eduschedule.domain.scheduler import SchedulingError
+from eduschedule.domain.unavailability import Unavailability
+
+BASE = datetime(2024, 11, 4, 8, 0, tzinfo=timezone.utc)
+HOUR = timedelta(hours=1)
+
+
+def _emp(emp_id: int, **kwargs) -> Employee:
+    return Employee(id=emp_id, name=f"E{emp_id}", email=f"e{emp_id}@example.com", role="staff", maxHours=kwargs.pop("maxHours", 10), **kwargs)
+
+
+def test_plan_repair_splits_shift_and_balances_gap():
+    shift = Schedule(id=10, employeeId=1, startUTC=BASE, endUTC=BASE + 6 * HOUR)
+    sick = Unavailability(id=5, employeeId=1, startUTC=BASE + 2 * HOUR, endUTC=BASE + 4 * HOUR)
+    candidates = [_emp(1, schedules=[shift]), _emp(2), _emp(3)]
+
+    plan = plan_repair(sick, [shift], candidates)
+
+    assert [(s.id, s.startUTC, s.endUTC) for s in plan.updated] == [(10, BASE, BASE + 2 * HOUR)]
+    assert [(s.employeeId, s.startUTC, s.endUTC) for s in plan.split] == [(1, BASE + 4 * HOUR, BASE + 6 * HOUR)]
+    assert [(s.employeeId, s.startUTC, s.endUTC) for s in plan.reassigned] == [
+        (2, BASE + 2 * HOUR, BASE + 3 * HOUR),
+        (3, BASE + 3 * HOUR, BASE + 4 * HOUR),
+    ]
+    assert plan.deleted == []
+
+
+def test_plan_repair_deletes_covered_shift_and_raises_without_cover():
+    shift = Schedule(id=11, employeeId=1, startUTC=BASE, endUTC=BASE + HOUR)
+    sick = Unavailability(id=6, employeeId=1, startUTC=BASE - HOUR, endUTC=BASE + 2 * HOUR)
+
+    plan = plan_repair(sick, [shift], [_emp(2)])
+    assert plan.deleted == [11]
+    assert [(s.employeeId, s.startUTC) for s in plan.reassigned] == [(2, BASE)]
+
+    with pytest.raises(SchedulingError):
+        plan_repair(sick, [shift], [_emp(2, maxHours=0)])
+
+
+def test_repair_schedule_cli_rewrites_only_affected_rows(cliEnv):
+    role = f"repair-{uuid4().hex[:8]}"
+    with session_scope() as s:
+        eRepo = EmployeeRepo(s)
+        absent = eRepo.create(name="Absent", email=f"absent_{role}@example.com", roleName=role)
+        cover = eRepo.create(name="Cover", email=f"cover_{role}@example.com", roleName=role)
+        sRepo = ScheduleRepo(s)
+        untouched = sRepo.create(employeeId=absent.id, startTime=BASE + 24 * HOUR, endTime=BASE + 26 * HOUR)
+        shift = sRepo.create(employeeId=absent.id, startTime=BASE, endTime=BASE + 3 * HOUR)
+        unv = UnavailabilityRepo(s).create(employeeId=absent.id, startTime=BASE + HOUR, endTime=BASE + 2 * HOUR, note="sick")
+        ids = (absent.id, cover.id, untouched.id, shift.id, unv.id)
+    absentId, coverId, untouchedId, shiftId, unvId = ids
+
+    result = CliRunner().invoke(app, ["repair-schedule", "--unavailability-id", str(unvId), "-z", "UTC"], env=cliEnv)
+    assert result.exit_code == 0, result.output
+    assert "3 rows written" in result.output
+
+    with session_scope() as s:
+        repo = ScheduleRepo(s)
+        absentRows = [(i.id, i.startUTC, i.endUTC) for i in repo.forEmployee(absentId)]
+        assert absentRows[0] == (shiftId, BASE, BASE + HOUR)
+        assert absentRows[1][1:] == (BASE + 2 * HOUR, BASE + 3 * HOUR)
+        assert absentRows[2] == (untouchedId, BASE + 24 * HOUR, BASE + 26 * HOUR)
+        assert [(i.startUTC, i.endUTC) for i in repo.forEmployee(coverId)] == [(BASE + HOUR, BASE + 2 * HOUR)]
@@ -51,3 +51,52 @@ def test_conflict_with_existing_schedule(session):
     with pytest.raises(ValueError):
         repo.create(employeeId=emp.id, startTime=start + timedelta(minutes=30), endTime=end + timedelta(hours=1))
 
+
+def test_bulk_create_reports_all_conflicts(session):
+    from eduschedule.domain.schedule import Schedule
+
+    emp = EmployeeRepo(session).create(name="D", email="d@d.com", roleName="r")
+    other = EmployeeRepo(session).create(name="E", email="e@e.com", roleName="r")
+    session.commit()
+    base = datetime(2024, 2, 1, 8, 0, tzinfo=timezone.utc)
+    hour = timedelta(hours=1)
+    repo = ScheduleRepo(session)
+    repo.create(employeeId=emp.id, startTime=base, endTime=base + hour)
+    UnavailabilityRepo(session).create(employeeId=other.id, startTime=base + 3 * hour, endTime=base + 4 * hour)
+    session.commit()
+
+    batch = [
+        Schedule(id=None, employeeId=emp.id, startUTC=base + hour, endUTC=base + 2 * hour),
+        Schedule(id=None, employeeId=emp.id, startUTC=base + timedelta(minutes=30), endUTC=base + hour),
+        Schedule(id=None, employeeId=other.id, startUTC=base + 3 * hour, endUTC=base + 5 * hour),
+        Schedule(id=None, employeeId=other.id, startUTC=base, endUTC=base + 2 * hour),
+        Schedule(id=None, employeeId=other.id, startUTC=base + hour, endUTC=base + 3 * hour),
+        Schedule(id=None, employeeId=other.id, startUTC=base.replace(tzinfo=None), endUTC=base + hour),
+    ]
+    result = repo.bulkCreate(batch)
+    session.commit()
+
+    assert result.created == 2
+    assert [idx for idx, _ in result.errors] == [1, 2, 4, 5]
+    assert [(s.startUTC, s.endUTC) for s in repo.forEmployee(emp.id)] == [(base, base + hour), (base + hour, base + 2 * hour)]
+    assert [(s.startUTC, s.endUTC) for s in repo.forEmployee(other.id)] == [(base, base + 2 * hour)]
+
+
+def test_coverage_gaps_streams_schedules(session):
+    repo = ScheduleRepo(session)
+    day = datetime(2033, 5, 2, 8, tzinfo=timezone.utc)
+    a, b = (EmployeeRepo(session).create(name=n, email=f"{n}@cover.example.com", roleName="cover-check") for n in ("cov-a", "cov-b"))
+    other = EmployeeRepo(session).create(name="cov-c", email="cov-c@cover.example.com", roleName="cover-other")
+    repo.create(employeeId=a.id, startTime=day - timedelta(hours=1), endTime=day + timedelta(hours=2))
+    repo.create(employeeId=b.id, startTime=day + timedelta(hours=1), endTime=day + timedelta(hours=3))
+    repo.create(employeeId=other.id, startTime=day + timedelta(hours=3), endTime=day + timedelta(hours=4))
+    session.commit()
+    start, end = day, day + timedelta(hours=5)
+
+    gaps = [(g.start - day, g.end - day, g.staffed) for g in repo.coverageGaps(start, end, role="cover-check", batchSize=1)]
+    assert gaps == [(timedelta(hours=1), timedelta(hours=2), 2), (timedelta(hours=3), timedelta(hours=5), 0)]
+    assert [(g.start - day, g.staffed) for g in repo.coverageGaps(start, end)] == [(timedelta(hours=1), 2), (timedelta(hours=4), 0)]
+
+    byRole = repo.coverageGapsByRole(start, end)
+    assert [(g.start - day, g.staffed) for g in byRole["cover-check"]] == [(timedelta(hours=1), 2), (timedelta(hours=3), 0)]
+    assert [(g.start - day, g.end - day) for g in byRole["cover-other"]] == [(timedelta(0), timedelta(hours=3)), (timedelta(hours=4), timedelta(hours=5))]
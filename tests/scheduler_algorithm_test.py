@@ -93,3 +93,175 @@ def test_generate_schedule_handles_existing_schedule_conflicts():
         (1, start + timedelta(hours=1), end),
     ]
     assert [(s.employeeId, s.startUTC, s.endUTC) for s in schedule] == expected
+
+
+def test_generate_schedule_uses_spare_capacity_for_trailing_partial_slot():
+    start = datetime(2024, 6, 3, 9, 0, tzinfo=timezone.utc)
+    end = start + timedelta(hours=2, minutes=30)
+    employees = [
+        _make_employee(1, maxHours=1),
+        _make_employee(2, maxHours=2),
+    ]
+    employees[0].schedules.append(
+        Schedule(id=7, employeeId=1, startUTC=start - timedelta(hours=1), endUTC=start - timedelta(minutes=30))
+    )
+
+    schedule = generate_schedule(start, end, employees)
+
+    expected = [
+        (2, start, start + timedelta(hours=2)),
+        (1, start + timedelta(hours=2), end),
+    ]
+    assert [(s.employeeId, s.startUTC, s.endUTC) for s in schedule] == expected
+
+
+def test_candidate_queue_skips_ineligible_and_drops_exhausted():
+    from eduschedule.domain.selection import CandidateQueue
+
+    queue = CandidateQueue([((0.0, 0.0, 0), 0), ((0.0, 0.0, 1), 1), ((5.0, 0.0, 2), 2)])
+
+    assert queue.select(lambda idx: idx != 0, exhausted=lambda idx: idx == 1) == 2
+    assert len(queue) == 1
+    assert queue.select(lambda idx: True) == 0
+    assert queue.select(lambda idx: True) is None
+
+
+def test_generate_schedule_runs_mode_splits_at_breakpoints():
+    start = datetime(2024, 7, 1, 9, 0, tzinfo=timezone.utc)
+    end = start + timedelta(hours=6)
+    meeting = Unavailability(
+        id=3,
+        employeeId=1,
+        startUTC=start + timedelta(hours=2, minutes=7),
+        endUTC=start + timedelta(hours=3, minutes=41),
+        note=None,
+    )
+    employees = [
+        _make_employee(1, unavailabilities=[meeting]),
+        _make_employee(2),
+    ]
+
+    schedule = generate_schedule(start, end, employees, slot_duration=timedelta(minutes=1), mode="runs")
+
+    expected = [
+        (1, start, meeting.startUTC),
+        (2, meeting.startUTC, end),
+    ]
+    assert [(s.employeeId, s.startUTC, s.endUTC) for s in schedule] == expected
+
+
+def test_generate_schedule_runs_mode_cuts_runs_at_capacity():
+    start = datetime(2024, 7, 2, 9, 0, tzinfo=timezone.utc)
+    end = start + timedelta(hours=5)
+    employees = [_make_employee(1, maxHours=2), _make_employee(2, maxHours=2), _make_employee(3, maxHours=1)]
+
+    schedule = generate_schedule(start, end, employees, mode="runs")
+
+    expected = [
+        (1, start, start + timedelta(hours=2)),
+        (2, start + timedelta(hours=2), start + timedelta(hours=4)),
+        (3, start + timedelta(hours=4), end),
+    ]
+    assert [(s.employeeId, s.startUTC, s.endUTC) for s in schedule] == expected
+
+    with pytest.raises(SchedulingError):
+        generate_schedule(start, end + timedelta(minutes=1), employees, mode="runs")
+
+
+def test_generate_schedule_numpy_engine_matches_python():
+    pytest.importorskip("numpy")
+    start = datetime(2024, 8, 5, 8, 0, tzinfo=timezone.utc)
+    end = start + timedelta(hours=10)
+    employees = [
+        _make_employee(
+            1,
+            maxHours=4,
+            unavailabilities=[
+                Unavailability(id=1, employeeId=1, startUTC=start + timedelta(minutes=50), endUTC=start + timedelta(hours=3))
+            ],
+        ),
+        _make_employee(
+            2,
+            maxHours=5,
+            schedules=[Schedule(id=2, employeeId=2, startUTC=start + timedelta(hours=6), endUTC=start + timedelta(hours=7))],
+        ),
+        _make_employee(3, maxHours=3, active=False),
+        _make_employee(4, maxHours=6),
+    ]
+    slot = timedelta(minutes=45)
+
+    expected = generate_schedule(start, end, employees, slot_duration=slot)
+
+    assert generate_schedule(start, end, employees, slot_duration=slot, engine="numpy") == expected
+
+
+@pytest.mark.parametrize("day", [datetime(2024, 3, 9, 22, 0), datetime(2024, 11, 2, 22, 0)])
+def test_generate_schedule_numpy_engine_matches_python_across_dst(day):
+    pytest.importorskip("numpy")
+    import random
+    from zoneinfo import ZoneInfo
+
+    tz = ZoneInfo("America/New_York")
+    rng = random.Random(day.month)
+    for _ in range(40):
+        start = day.replace(tzinfo=tz) + timedelta(minutes=15 * rng.randrange(16))
+        end = start + timedelta(hours=rng.randrange(4, 9))
+        employees = []
+        for emp_id in range(1, 5):
+            busy_start = start + timedelta(minutes=30 * rng.randrange(12))
+            employees.append(_make_employee(emp_id, maxHours=rng.randrange(2, 6), unavailabilities=[
+                Unavailability(id=emp_id, employeeId=emp_id, startUTC=busy_start, endUTC=busy_start + timedelta(hours=1))
+            ]))
+        slot = timedelta(minutes=rng.choice((20, 30, 45, 60)))
+        try:
+            expected = generate_schedule(start, end, employees, slot_duration=slot)
+        except SchedulingError:
+            with pytest.raises(SchedulingError):
+                generate_schedule(start, end, employees, slot_duration=slot, engine="numpy")
+            continue
+        assert generate_schedule(start, end, employees, slot_duration=slot, engine="numpy") == expected
+        # Slots are real elapsed time: the plan covers the window exactly once
+        assert sum((s.endUTC - s.startUTC for s in expected), timedelta()) == end.astimezone(timezone.utc) - start.astimezone(timezone.utc)
+
+
+def test_generate_schedule_rejects_unknown_engine():
+    start = datetime(2024, 8, 6, 8, 0, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        generate_schedule(start, start + timedelta(hours=1), [_make_employee(1)], engine="fortran")
+
+
+def test_generate_schedule_prefers_booked_seconds_over_loaded_schedules():
+    start = datetime(2024, 9, 2, 9, 0, tzinfo=timezone.utc)
+    end = start + timedelta(hours=2)
+    employees = [_make_employee(1, maxHours=3, bookedSeconds=2 * 3600.0), _make_employee(2, maxHours=3)]
+
+    schedule = generate_schedule(start, end, employees)
+
+    assert [(s.employeeId, s.startUTC, s.endUTC) for s in schedule] == [(2, start, end)]
+
+
+def test_iter_schedule_streams_merged_runs_before_failure():
+    from eduschedule.domain.scheduler import iter_schedule
+
+    start = datetime(2024, 9, 9, 9, 0, tzinfo=timezone.utc)
+    end = start + timedelta(hours=4)
+    employees = [
+        _make_employee(1, maxHours=2),
+        _make_employee(
+            2,
+            unavailabilities=[Unavailability(id=1, employeeId=2, startUTC=start, endUTC=start + timedelta(hours=2))],
+        ),
+    ]
+    employees[1].unavailabilities.append(
+        Unavailability(id=2, employeeId=2, startUTC=start + timedelta(hours=3), endUTC=end)
+    )
+
+    with pytest.raises(ValueError):
+        iter_schedule(start, start, employees)
+
+    stream = iter_schedule(start, end, employees)
+    first = next(stream)
+    assert (first.employeeId, first.startUTC, first.endUTC) == (1, start, start + timedelta(hours=2))
+    # Employee 2's 11:00-12:00 run is still open when 12:00 turns out uncoverable
+    with pytest.raises(SchedulingError):
+        next(stream)
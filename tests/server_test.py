@@ -0,0 +1,93 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+import uuid
+
+from eduschedule.adapters.sql.engine import session_scope
+from eduschedule.adapters.sql.repositories.employees import EmployeeRepo
+from eduschedule.server import makeServer
+
+
+def _call(port: int, path: str, body: dict | None = None) -> tuple[int, dict]:
+    data = None if body is None else json.dumps(body).encode()
+    req = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=data, method="GET" if body is None else "POST")
+    try:
+        with urllib.request.urlopen(req) as res:
+            return res.status, json.loads(res.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def testServeGenerateFreeAndRepair(cliEnv):
+    role = f"serve-{uuid.uuid4().hex[:8]}"
+    with session_scope() as s:
+        repo = EmployeeRepo(s)
+        first = repo.create(name="S1", email=f"{role}-1@example.com", roleName=role, maxHours=10)
+        second = repo.create(name="S2", email=f"{role}-2@example.com", roleName=role, maxHours=10)
+
+    server = makeServer(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_port
+    try:
+        window = {"start": "2031-01-06T09:00:00+00:00", "end": "2031-01-06T11:00:00+00:00", "role": role}
+        status, free = _call(port, "/free", window)
+        assert status == 200
+        assert [e["id"] for e in free["employees"]] == [first.id, second.id]
+
+        status, generated = _call(port, "/generate", window)
+        assert status == 200, generated
+        assert [s["employeeId"] for s in generated["schedules"]] == [first.id, second.id]
+
+        # The snapshot saw the new schedules without a reload
+        status, free = _call(port, "/free", window)
+        assert free["employees"] == []
+
+        status, unv = _call(port, "/unavailability", {
+            "employeeId": first.id, "start": "2031-01-06T09:00:00+00:00", "end": "2031-01-06T10:00:00+00:00",
+        })
+        assert status == 200, unv
+        status, repaired = _call(port, "/repair", {"unavailabilityId": unv["id"]})
+        assert status == 200, repaired
+        assert [s["employeeId"] for s in repaired["reassigned"]] == [second.id]
+
+        status, error = _call(port, "/free", {"start": "2031-01-06T09:00:00", "end": "2031-01-06T10:00:00+00:00"})
+        assert status == 400 and "offset" in error["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def testServeStoresOffsetsAsUtcAndAnswersUnexpectedErrors(cliEnv, monkeypatch):
+    from eduschedule.adapters.sql.repositories.unavailabilities import UnavailabilityRepo
+
+    tag = f"offset-{uuid.uuid4().hex[:8]}"
+    with session_scope() as s:
+        emp = EmployeeRepo(s).create(name="O1", email=f"{tag}@example.com", roleName=tag)
+
+    server = makeServer(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_port
+    try:
+        status, unv = _call(port, "/unavailability", {
+            "employeeId": emp.id, "start": "2031-02-03T11:00:00+02:00", "end": "2031-02-03T12:30:00+02:00",
+        })
+        assert status == 200, unv
+        assert (unv["start"], unv["end"]) == ("2031-02-03T09:00:00+00:00", "2031-02-03T10:30:00+00:00")
+        with session_scope() as s:
+            stored = UnavailabilityRepo(s).getById(unv["id"])
+            assert stored.startUTC.isoformat() == "2031-02-03T09:00:00+00:00"
+
+        def fail(*_args, **_kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(EmployeeRepo, "getById", fail)
+        status, error = _call(port, "/unavailability", {
+            "employeeId": emp.id, "start": "2031-02-04T09:00:00+00:00", "end": "2031-02-04T10:00:00+00:00",
+        })
+        assert status == 500 and "RuntimeError" in error["error"]
+    finally:
+        server.shutdown()
+        server.server_close()